@@ -0,0 +1,55 @@
+"""Run the benchmark suite.
+
+    python -m benchmarks                                # micro + macro
+    python -m benchmarks --only micro --output bench.json
+    python -m benchmarks --compare bench.json           # exit 1 on regressions
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import sys
+
+from benchmarks import environment
+from benchmarks import runner
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Auth and user hot path benchmarks")
+    parser.add_argument("--only", choices=["micro", "macro"], help="Run one group only")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per macro benchmark")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--compare", metavar="BASELINE", help="Compare against a previous --output file")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Median slowdown counted as a regression (default 0.2 = 20%%)"
+    )
+    args = parser.parse_args()
+
+    results = {}
+    try:
+        if args.only in (None, "micro"):
+            from benchmarks import micro
+            results.update(micro.run())
+        if args.only in (None, "macro"):
+            from benchmarks import macro
+            results.update(asyncio.run(macro.run(requests=args.requests)))
+    finally:
+        shutil.rmtree(environment.BENCH_DIR, ignore_errors=True)
+
+    runner.print_results(results)
+    data = runner.report(results, os.environ["DATABASE_URL"])
+    if args.output:
+        runner.save(args.output, data)
+    if args.compare:
+        regressions = runner.compare(results, runner.load(args.compare), args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+"""Full ASGI requests through the application, over an in-process client."""
+import itertools
+import httpx
+from sqlalchemy import insert
+from db.database import AsyncSessionLocal
+from db.models import UserDB, UserRole
+from utils.security import get_password_hash
+from benchmarks.runner import abench
+
+ADMIN_EMAIL = "admin@bench.example.com"
+PASSWORD = "bench-password"
+SEED_USERS = 500
+
+
+async def _seed() -> None:
+    hashed_password = get_password_hash(PASSWORD)
+    async with AsyncSessionLocal() as session:
+        await session.execute(insert(UserDB), [
+            {
+                "email": f"seed{number}@bench.example.com",
+                "full_name": f"Seed {number}",
+                "hashed_password": hashed_password,
+                "is_active": True,
+                "role": UserRole.CLIENT,
+                "token_version": 0,
+            }
+            for number in range(SEED_USERS)
+        ])
+        await session.execute(insert(UserDB).values(
+            email=ADMIN_EMAIL,
+            full_name="Bench Admin",
+            hashed_password=hashed_password,
+            is_active=True,
+            role=UserRole.ADMIN,
+            token_version=0
+        ))
+        await session.commit()
+
+
+async def run(requests: int = 200) -> dict:
+    # Imported here so benchmarks.environment is applied first
+    from main import app
+
+    async with app.router.lifespan_context(app):
+        await _seed()
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            login = {"email": ADMIN_EMAIL, "password": PASSWORD}
+            response = await client.post("/api/v1/auth/login", json=login)
+            response.raise_for_status()
+            headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+            signups = itertools.count()
+
+            async def post_login():
+                (await client.post("/api/v1/auth/login", json=login)).raise_for_status()
+
+            async def get_me():
+                (await client.get("/api/v1/users/me", headers=headers)).raise_for_status()
+
+            async def get_list():
+                (await client.get("/api/v1/users/list", headers=headers, params={"limit": 100})).raise_for_status()
+
+            async def post_user():
+                user = {
+                    "email": f"signup{next(signups)}@bench.example.com",
+                    "full_name": "Signup",
+                    "password": PASSWORD,
+                    "role": "CLIENT",
+                }
+                (await client.post("/api/v1/users", json=user)).raise_for_status()
+
+            # bcrypt bound: fewer requests
+            bcrypt_requests = max(requests // 10, 5)
+            return {
+                "macro.POST /auth/login": await abench(post_login, requests=bcrypt_requests, warmup=2),
+                "macro.GET /users/me": await abench(get_me, requests=requests),
+                "macro.GET /users/list": await abench(get_list, requests=requests),
+                "macro.POST /users": await abench(post_user, requests=bcrypt_requests, warmup=2),
+            }
@@ -0,0 +1,119 @@
+import json
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+from typing import Awaitable, Callable
+
+# A micro-benchmark round runs the function repeatedly for at least this long
+MIN_ROUND_SECONDS = 0.05
+
+
+def summarize(samples_us: list[float], calls_per_sample: int = 1) -> dict:
+    """Per-call statistics, in microseconds, from per-call samples."""
+    ordered = sorted(samples_us)
+    median = statistics.median(ordered)
+    return {
+        "samples": len(ordered),
+        "calls_per_sample": calls_per_sample,
+        "min_us": round(ordered[0], 3),
+        "median_us": round(median, 3),
+        "mean_us": round(statistics.fmean(ordered), 3),
+        "p95_us": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+        "ops_per_sec": round(1_000_000 / median, 1) if median else None,
+    }
+
+
+def _calibrate(func: Callable[[], object]) -> int:
+    """Number of calls that makes one round last at least MIN_ROUND_SECONDS."""
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        if time.perf_counter() - started >= MIN_ROUND_SECONDS:
+            return number
+        number *= 2
+
+
+def bench(func: Callable[[], object], rounds: int = 20) -> dict:
+    """Time a cheap synchronous call over ``rounds`` calibrated rounds."""
+    number = _calibrate(func)
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter_ns()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter_ns() - started) / number / 1000)
+    return summarize(samples, calls_per_sample=number)
+
+
+async def abench(func: Callable[[], Awaitable[object]], requests: int = 200, warmup: int = 20) -> dict:
+    """Time ``requests`` sequential awaits of ``func``, one sample per call."""
+    for _ in range(warmup):
+        await func()
+    samples = []
+    for _ in range(requests):
+        started = time.perf_counter_ns()
+        await func()
+        samples.append((time.perf_counter_ns() - started) / 1000)
+    return summarize(samples)
+
+
+def report(results: dict, database_url: str) -> dict:
+    return {
+        "meta": {
+            "created_at": datetime.utcnow().isoformat(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "database": database_url.split(":", 1)[0],
+        },
+        "results": results,
+    }
+
+
+def print_results(results: dict) -> None:
+    width = max(len(name) for name in results)
+    print(f"{'benchmark':<{width}}  {'median us':>12}  {'p95 us':>12}  {'ops/s':>12}")
+    for name, result in results.items():
+        print(
+            f"{name:<{width}}  {result['median_us']:>12.1f}  "
+            f"{result['p95_us']:>12.1f}  {result['ops_per_sec'] or 0:>12.1f}"
+        )
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Print median changes against a baseline and return regressed names.
+
+    A benchmark regresses when its median is more than ``threshold``
+    (a fraction, 0.2 = 20%) slower than in the baseline.
+    """
+    regressions = []
+    baseline_results = baseline["results"]
+    width = max(len(name) for name in results)
+    print(f"\n{'benchmark':<{width}}  {'baseline us':>12}  {'current us':>12}  {'change':>8}")
+    for name, result in results.items():
+        if name not in baseline_results:
+            print(f"{name:<{width}}  {'-':>12}  {result['median_us']:>12.1f}  {'new':>8}")
+            continue
+        before = baseline_results[name]["median_us"]
+        after = result["median_us"]
+        change = (after - before) / before if before else 0.0
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<{width}}  {before:>12.1f}  {after:>12.1f}  {change:>+8.1%}{flag}")
+    return regressions
+
+
+def load(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def save(path: str, data: dict) -> None:
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
@@ -1,20 +1,112 @@
 from datetime import timedelta
+from typing import Literal, Optional
 from pydantic_settings import BaseSettings
 
+# Database engine profiles, selected with ENVIRONMENT. Individual DB_*
+# settings override the profile values; SQL echo is only ever on in dev.
+DB_ENGINE_PROFILES = {
+    "dev": {
+        "echo": None,  # follows DEBUG, or DB_ECHO when set
+        "pool": "queue",
+        "pool_size": 5,
+        "max_overflow": 10,
+        "pool_timeout": 30,
+        "pool_recycle": 1800,
+        "pool_pre_ping": True,
+        "statement_cache_size": 100,
+    },
+    "prod": {
+        "echo": False,
+        "pool": "queue",
+        "pool_size": 10,
+        "max_overflow": 20,
+        "pool_timeout": 10,
+        "pool_recycle": 1800,
+        "pool_pre_ping": True,
+        "statement_cache_size": 500,
+    },
+    "test": {
+        "echo": False,
+        "pool": "null",  # No pooling: every session gets a fresh connection
+        "pool_pre_ping": False,
+        "statement_cache_size": 0,
+    },
+}
+
 class Settings(BaseSettings):
     # Database settings
     DATABASE_URL: str
+    # Selects the engine profile; defaults to prod so an unconfigured deploy is safe
+    ENVIRONMENT: Literal["dev", "test", "prod"] = "prod"
+    DB_ECHO: Optional[bool] = None  # dev only
+    DB_POOL_SIZE: Optional[int] = None
+    DB_MAX_OVERFLOW: Optional[int] = None
+    DB_POOL_TIMEOUT: Optional[float] = None
+    DB_POOL_RECYCLE: Optional[int] = None
+    DB_POOL_PRE_PING: Optional[bool] = None
+    DB_STATEMENT_CACHE_SIZE: Optional[int] = None  # asyncpg prepared statement cache
+    # Comma-separated read replica URLs; read-only endpoints use them when set
+    DATABASE_REPLICA_URLS: str = ""
+    REPLICA_EJECT_SECONDS: float = 30  # How long a failing replica is skipped
+    REPLICA_HEALTH_CHECK_INTERVAL_SECONDS: float = 10
+    SLOW_QUERY_THRESHOLD_MS: float = 200  # Log slower statements (parameters redacted); 0 disables
     
     
     # Application settings
     DEBUG: bool = True
     API_V1_PREFIX: str = "/api/v1"
+    USER_BULK_MAX_ROWS: int = 10000  # Rows accepted by POST /users/bulk
+    USER_BULK_MAX_BYTES: int = 10 * 1024 * 1024  # Body size accepted by POST /users/bulk
+    USER_BATCH_MAX_SIZE: int = 500  # Ids accepted by POST /users/batch
+    SERVER_TIMING_ENABLED: bool = True  # Server-Timing header with DB time and query count
+
+    # On-demand request profiling (pyinstrument); admins send PROFILING_HEADER
+    PROFILING_ENABLED: Optional[bool] = None  # Off by default in prod
+    PROFILING_HEADER: str = "X-Profile"
+    PROFILING_SAMPLE_RATE: float = 0.0  # Fraction of all requests profiled at random
+    PROFILING_INTERVAL_SECONDS: float = 0.001
+    PROFILING_BUFFER_SIZE: int = 20  # Profiles kept in memory
     APP_NAME: str = "Your App"  # Default app name
     
     # JWT Settings
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1000
+    # Embed uid/role/is_active/token version in access tokens so requests
+    # can be authenticated without loading the user row
+    JWT_EMBED_CLAIMS: bool = False
+
+    # Password hashing settings
+    PASSWORD_HASH_EXECUTOR: str = "thread"  # "thread" or "process"
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 64  # Pending hash/verify jobs before rejecting with 503
+    PASSWORD_HASH_BATCH_WORKERS: Optional[int] = None  # Workers bulk imports may use; default all but one
+
+    # Authenticated principal cache (per process)
+    PRINCIPAL_CACHE_SIZE: int = 10000
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 30
+    TOKEN_VERSION_CACHE_SIZE: int = 100000
+    TOKEN_VERSION_CACHE_TTL_SECONDS: float = 30
+
+    # In-memory revocation index in front of blacklisted_tokens
+    REVOCATION_INDEX_ENABLED: bool = True
+    REVOCATION_SYNC_INTERVAL_SECONDS: float = 5  # How quickly other workers' revocations are seen
+    REVOCATION_INDEX_MAX_ENTRIES: int = 1_000_000  # Past this, fall back to querying the table
+
+    # Login throttling: token buckets per client IP and per email, checked
+    # before bcrypt runs. BURST attempts at once, refilled at PER_MINUTE.
+    LOGIN_RATE_LIMIT_ENABLED: bool = True
+    LOGIN_RATE_LIMIT_BACKEND: str = "memory"  # "memory" (per worker) or "database" (shared)
+    LOGIN_IP_BURST: int = 20
+    LOGIN_IP_PER_MINUTE: float = 10
+    LOGIN_EMAIL_BURST: int = 5
+    LOGIN_EMAIL_PER_MINUTE: float = 2
+    RATE_LIMIT_MAX_KEYS: int = 50000  # Buckets kept by the memory backend
+
+    # Periodic purge of expired rows (blacklisted tokens, reset tokens, ...)
+    PURGE_ENABLED: bool = True
+    PURGE_INTERVAL_SECONDS: float = 600
+    PURGE_BATCH_SIZE: int = 1000
     
     # PostgreSQL settings
     POSTGRES_USER: str
@@ -30,7 +122,42 @@ class Settings(BaseSettings):
     SMTP_HOST: str = "mailcatcher"
     SMTP_PORT: int = 1025
     SENDER_EMAIL: str = "noreply@yourdomain.com"
+    SMTP_POOL_SIZE: int = 2
+    SMTP_KEEPALIVE_SECONDS: int = 30  # Idle sessions older than this are probed with NOOP before reuse
+    SMTP_TIMEOUT: int = 10
+
+    # Email outbox settings
+    EMAIL_DISPATCHER_ENABLED: bool = True  # Run the outbox dispatcher inside the API process
+    EMAIL_DISPATCH_BATCH_SIZE: int = 50
+    EMAIL_DISPATCH_INTERVAL_SECONDS: float = 2
+    EMAIL_MAX_ATTEMPTS: int = 8
+    EMAIL_RETRY_BASE_SECONDS: float = 30
+    EMAIL_RETRY_MAX_SECONDS: float = 3600
+    EMAIL_LEASE_SECONDS: float = 300  # Claimed rows are retried after this if never recorded
     
+    def replica_urls(self) -> list[str]:
+        return [url.strip() for url in self.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+
+    def profiling_enabled(self) -> bool:
+        if self.PROFILING_ENABLED is not None:
+            return self.PROFILING_ENABLED
+        return self.ENVIRONMENT != "prod"
+
+    def db_engine_profile(self) -> dict:
+        profile = dict(DB_ENGINE_PROFILES[self.ENVIRONMENT])
+        overrides = {
+            "pool_size": self.DB_POOL_SIZE,
+            "max_overflow": self.DB_MAX_OVERFLOW,
+            "pool_timeout": self.DB_POOL_TIMEOUT,
+            "pool_recycle": self.DB_POOL_RECYCLE,
+            "pool_pre_ping": self.DB_POOL_PRE_PING,
+            "statement_cache_size": self.DB_STATEMENT_CACHE_SIZE,
+        }
+        profile.update({key: value for key, value in overrides.items() if value is not None})
+        if profile["echo"] is None:
+            profile["echo"] = self.DB_ECHO if self.DB_ECHO is not None else self.DEBUG
+        return profile
+
     class Config:
         env_file = ".env"
 
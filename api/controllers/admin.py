@@ -0,0 +1,40 @@
+from fastapi import HTTPException
+from fastapi.responses import HTMLResponse, Response
+from models.admin import ProfileList, ProfileSummary
+from models.user import User
+from db.models import UserRole
+from services.profile_store import profile_store
+
+class AdminController:
+    @staticmethod
+    def _require_admin(current_user: User) -> None:
+        if current_user.role != UserRole.ADMIN:
+            raise HTTPException(status_code=403, detail="Admin role required")
+
+    @staticmethod
+    async def list_profiles(current_user: User) -> ProfileList:
+        AdminController._require_admin(current_user)
+        return ProfileList(
+            items=[ProfileSummary.model_validate(profile) for profile in profile_store.list()]
+        )
+
+    @staticmethod
+    async def get_profile(current_user: User, profile_id: int, format: str) -> Response:
+        AdminController._require_admin(current_user)
+        profile = profile_store.get(profile_id)
+        if profile is None:
+            raise HTTPException(status_code=404, detail="Profile not found")
+        content = profile_store.render(profile, format)
+        if format == "html":
+            return HTMLResponse(content)
+        # Open in https://www.speedscope.app
+        return Response(
+            content,
+            media_type="application/json",
+            headers={"Content-Disposition": f'attachment; filename="profile-{profile_id}.speedscope.json"'}
+        )
+
+    @staticmethod
+    async def clear_profiles(current_user: User) -> None:
+        AdminController._require_admin(current_user)
+        profile_store.clear()
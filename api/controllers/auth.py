@@ -3,11 +3,17 @@ from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from models.auth import Token, LoginRequest
 from services.auth_service import AuthService
+from services.rate_limiter import rate_limiter, login_ip_limit, login_email_limit
 from config import settings
 
 class AuthController:
     @staticmethod
-    async def login(login_data: LoginRequest, db: AsyncSession) -> Token:
+    async def login(login_data: LoginRequest, db: AsyncSession, client_ip: str | None = None) -> Token:
+        # Throttle before bcrypt runs, including for unknown emails
+        if client_ip:
+            await rate_limiter.check(login_ip_limit, client_ip)
+        await rate_limiter.check(login_email_limit, login_data.email.strip().lower())
+
         auth_service = AuthService(db)
         user = await auth_service.authenticate_user(
             login_data.email, 
@@ -23,7 +29,7 @@ class AuthController:
             
         access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
         access_token = auth_service.create_access_token(
-            data={"sub": user.email},
+            data=auth_service.build_token_claims(user),
             expires_delta=access_token_expires
         )
         
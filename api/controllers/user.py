@@ -1,40 +1,186 @@
-from fastapi import HTTPException, APIRouter, Depends
+from fastapi import HTTPException, APIRouter, Depends, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from models.user import User, UserCreate, UserUpdate
-from services.user_service import UserService
-from typing import List
+from models.user import User, UserCreate, UserUpdate, UserBatchRequest, BulkUserResult, BulkUserReport
+from pydantic import ValidationError
+from config import settings
+from utils.bulk_import import parse_rows
+from services.user_service import UserService, USER_COLUMNS
 from utils.auth import get_current_user
 from db.models import UserRole
-from db.database import get_db
+from db.database import get_db, ReadSessionLocal
+from utils.export import USER_EXPORT_COLUMNS, rows_to_csv, rows_to_ndjson
+from utils.pagination import encode_cursor, decode_cursor
+from utils.responses import FastJSONResponse, RowSerializer
+from utils.http_cache import cache_headers, collection_etag, not_modified, user_etag
 
 router = APIRouter()
 
+# Listing rows are rendered straight to JSON; they already have the User shape
+user_rows = RowSerializer([column.key for column in USER_COLUMNS])
+
 class UserController:
     @staticmethod
-    async def get_users_list(current_user: User, db: AsyncSession) -> List[User]:
+    async def get_users_list(
+        current_user: User,
+        db: AsyncSession,
+        limit: int = 100,
+        cursor: str | None = None,
+        role: UserRole | None = None,
+        is_active: bool | None = None,
+        email_prefix: str | None = None,
+        if_none_match: str | None = None
+    ) -> Response:
         if current_user.role != UserRole.ADMIN:
             raise HTTPException(status_code=403, detail="Admin role required")
+
+        before_id = None
+        if cursor:
+            before_id = decode_cursor(cursor).get("id")
+            if not isinstance(before_id, int):
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+
+        user_service = UserService(db)
+        rows, next_before_id = await user_service.list_user_rows(
+            limit=limit,
+            before_id=before_id,
+            role=role,
+            is_active=is_active,
+            email_prefix=email_prefix
+        )
+        next_cursor = encode_cursor({"id": next_before_id}) if next_before_id is not None else None
+        etag = collection_etag(rows, next_cursor)
+        unchanged = not_modified(if_none_match, etag)
+        if unchanged is not None:
+            return unchanged
+        # Returning a response skips response_model validation of every row
+        return FastJSONResponse(
+            {"items": user_rows.to_dicts(rows), "next_cursor": next_cursor},
+            headers=cache_headers(etag)
+        )
+
+    @staticmethod
+    async def get_users_batch(
+        batch: UserBatchRequest,
+        db: AsyncSession,
+        if_none_match: str | None = None
+    ) -> Response:
         user_service = UserService(db)
-        return await user_service.get_latest_users(limit=100)
+        rows, missing = await user_service.get_user_rows_by_ids(batch.ids)
+        etag = collection_etag(rows, *missing)
+        unchanged = not_modified(if_none_match, etag)
+        if unchanged is not None:
+            return unchanged
+        return FastJSONResponse(
+            {"items": user_rows.to_dicts(rows), "missing": missing},
+            headers=cache_headers(etag)
+        )
+
+    @staticmethod
+    async def export_users(current_user: User, format: str, chunk_size: int) -> StreamingResponse:
+        if current_user.role != UserRole.ADMIN:
+            raise HTTPException(status_code=403, detail="Admin role required")
+
+        async def generate():
+            # The response outlives the request's session, so use a dedicated
+            # one; a full scan is a good fit for a replica
+            async with ReadSessionLocal() as session:
+                user_service = UserService(session)
+                if format == "csv":
+                    yield rows_to_csv([], header=USER_EXPORT_COLUMNS)
+                async for rows in user_service.iter_user_rows(chunk_size=chunk_size):
+                    yield rows_to_csv(rows) if format == "csv" else rows_to_ndjson(rows)
+
+        media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+        return StreamingResponse(
+            generate(),
+            media_type=media_type,
+            headers={"Content-Disposition": f'attachment; filename="users.{format}"'}
+        )
+
+    @staticmethod
+    async def bulk_create_users(
+        current_user: User,
+        body: bytes,
+        content_type: str,
+        db: AsyncSession
+    ) -> BulkUserReport:
+        if current_user.role != UserRole.ADMIN:
+            raise HTTPException(status_code=403, detail="Admin role required")
+
+        rows = parse_rows(body, content_type)
+        if len(rows) > settings.USER_BULK_MAX_ROWS:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Too many rows, at most {settings.USER_BULK_MAX_ROWS} are accepted"
+            )
+
+        results: list[BulkUserResult] = []
+        valid: dict[str, tuple[BulkUserResult, UserCreate]] = {}
+        for number, row in enumerate(rows, start=1):
+            if row is None:
+                results.append(BulkUserResult(row=number, status="invalid", error="Malformed row"))
+                continue
+            try:
+                user_data = UserCreate.model_validate(row)
+            except ValidationError as e:
+                error = e.errors()[0]
+                field = ".".join(str(part) for part in error["loc"])
+                # NDJSON rows may carry any JSON value here
+                email = row.get("email")
+                results.append(BulkUserResult(
+                    row=number,
+                    email=email if isinstance(email, str) else None,
+                    status="invalid",
+                    error=f"{field}: {error['msg']}"
+                ))
+                continue
+            if user_data.role == UserRole.ADMIN:
+                error = "Admin role is not allowed to be created by this endpoint"
+                results.append(BulkUserResult(row=number, email=user_data.email, status="invalid", error=error))
+                continue
+
+            result = BulkUserResult(row=number, email=user_data.email, status="duplicate")
+            results.append(result)
+            if user_data.email not in valid:
+                valid[user_data.email] = (result, user_data)
+
+        user_service = UserService(db)
+        created = await user_service.bulk_create_users([user_data for _, user_data in valid.values()])
+        for email, (result, _) in valid.items():
+            if email in created:
+                result.status = "created"
+                result.id = created[email]
+
+        statuses = [result.status for result in results]
+        return BulkUserReport(
+            created=statuses.count("created"),
+            duplicates=statuses.count("duplicate"),
+            invalid=statuses.count("invalid"),
+            results=results
+        )
 
     @staticmethod
     async def create_user(user_data: UserCreate, db: AsyncSession) -> User:
         user_service = UserService(db)
-        
-        # Check if user already exists
-        existing_user = await user_service.get_user_by_email(user_data.email)
-        if existing_user:
-            raise HTTPException(status_code=400, detail="Email already registered")
-            
         return await user_service.create_user(user_data)
 
     @staticmethod
-    async def get_user(user_id: int, db: AsyncSession) -> User:
+    async def get_user(user_id: int, db: AsyncSession, if_none_match: str | None = None) -> Response:
         user_service = UserService(db)
         user = await user_service.get_user(user_id)
         if user is None:
             raise HTTPException(status_code=404, detail="User not found")
-        return user 
+        return UserController.user_response(user, if_none_match)
+
+    @staticmethod
+    def user_response(user: User, if_none_match: str | None = None) -> Response:
+        """``user`` with its ETag, or a 304 if the client's copy is current."""
+        etag = user_etag(user.id, user.updated_at)
+        unchanged = not_modified(if_none_match, etag)
+        if unchanged is not None:
+            return unchanged
+        return FastJSONResponse(user.model_dump(), headers=cache_headers(etag))
     
     @staticmethod
     async def update_user(current_user: User, user_id: int, user_data: UserUpdate, db: AsyncSession) -> User:
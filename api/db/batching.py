@@ -0,0 +1,25 @@
+from sqlalchemy import ColumnElement, delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+
+async def delete_in_batches(
+    db: AsyncSession,
+    key: InstrumentedAttribute,
+    whereclause: ColumnElement[bool],
+    batch_size: int = 1000,
+) -> int:
+    """Delete the rows matching ``whereclause``, ``batch_size`` at a time.
+
+    ``key`` is the model's primary key column. Each batch is its own short
+    transaction so a purge never holds locks on a large part of the table.
+    Returns the number of rows removed.
+    """
+    removed = 0
+    while True:
+        batch = select(key).where(whereclause).limit(batch_size).scalar_subquery()
+        result = await db.execute(delete(key.class_).where(key.in_(batch)))
+        await db.commit()
+        removed += result.rowcount
+        if result.rowcount < batch_size:
+            return removed
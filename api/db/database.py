@@ -1,11 +1,63 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 from config import settings
 from .models import Base
+from .instrumentation import instrument_engine
+from .pool_metrics import InstrumentedAsyncPool
+from .routing import ReplicaSet, RoutingSession
 
-engine = create_async_engine(settings.DATABASE_URL, echo=settings.DEBUG)
+def engine_options(url: str, profile: dict) -> dict:
+    """Translate a Settings engine profile into create_async_engine arguments."""
+    options = {
+        "echo": profile["echo"],
+        "pool_pre_ping": profile["pool_pre_ping"],
+    }
+    if profile["pool"] == "null":
+        options["poolclass"] = NullPool
+    else:
+        options.update({
+            "poolclass": InstrumentedAsyncPool,
+            "pool_size": profile["pool_size"],
+            "max_overflow": profile["max_overflow"],
+            "pool_timeout": profile["pool_timeout"],
+            "pool_recycle": profile["pool_recycle"],
+        })
+    if url.startswith("postgresql+asyncpg"):
+        options["connect_args"] = {
+            # asyncpg's own cache, and SQLAlchemy's per-connection cache
+            # of prepared statements on top of it
+            "statement_cache_size": profile["statement_cache_size"],
+            "prepared_statement_cache_size": profile["statement_cache_size"],
+        }
+    return options
+
+engine = create_async_engine(
+    settings.DATABASE_URL,
+    **engine_options(settings.DATABASE_URL, settings.db_engine_profile())
+)
 AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
+replica_set = ReplicaSet(
+    [
+        create_async_engine(url, **engine_options(url, settings.db_engine_profile()))
+        for url in settings.replica_urls()
+    ],
+    eject_seconds=settings.REPLICA_EJECT_SECONDS
+)
+for instrumented in [engine, *(replica.engine for replica in replica_set.replicas)]:
+    instrument_engine(instrumented, slow_query_seconds=settings.SLOW_QUERY_THRESHOLD_MS / 1000)
+
+# Sessions for read-only endpoints: SELECTs go to a replica (or the primary
+# when none is configured or available), anything else to the primary
+ReadSessionLocal = sessionmaker(
+    class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    expire_on_commit=False,
+    primary=engine,
+    replicas=replica_set
+)
+
 async def init_db():
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
@@ -15,4 +67,13 @@ async def get_db():
         try:
             yield session
         finally:
-            await session.close() 
\ No newline at end of file
+            await session.close()
+
+async def get_read_db():
+    """Session for read-only endpoints; may lag the primary slightly."""
+    async with ReadSessionLocal() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
@@ -0,0 +1,146 @@
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStats:
+    """Statements executed inside one ``track_queries`` scope.
+
+    Scopes nest: a statement counts towards the innermost scope and every
+    scope around it. ``statements`` is only kept when asked for.
+    """
+
+    __slots__ = ("count", "seconds", "statements", "parent")
+
+    def __init__(self, parent: "QueryStats | None" = None, keep_statements: bool = False):
+        self.count = 0
+        self.seconds = 0.0
+        self.statements: list[str] | None = [] if keep_statements else None
+        self.parent = parent
+
+    def record(self, statement: str, seconds: float) -> None:
+        stats = self
+        while stats is not None:
+            stats.count += 1
+            stats.seconds += seconds
+            if stats.statements is not None:
+                stats.statements.append(statement)
+            stats = stats.parent
+
+
+_current_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+def current_query_stats() -> QueryStats | None:
+    return _current_stats.get()
+
+
+@contextmanager
+def track_queries(keep_statements: bool = False) -> Iterator[QueryStats]:
+    """Count statements executed by the current task (and tasks it starts)."""
+    stats = QueryStats(parent=_current_stats.get(), keep_statements=keep_statements)
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+@contextmanager
+def assert_query_budget(max_queries: int) -> Iterator[QueryStats]:
+    """Fail if the block runs more than ``max_queries`` statements.
+
+    Requests sent through ``httpx.ASGITransport`` run in the caller's
+    context, so this works around a whole endpoint call::
+
+        with assert_query_budget(2):
+            await client.get("/api/v1/users/me", headers=headers)
+    """
+    with track_queries(keep_statements=True) as stats:
+        yield stats
+    if stats.count > max_queries:
+        statements = "\n".join(f"  {statement}" for statement in stats.statements)
+        raise AssertionError(
+            f"Expected at most {max_queries} queries, {stats.count} were executed:\n{statements}"
+        )
+
+
+def redact_parameters(parameters, executemany: bool = False) -> str:
+    """Describe bound parameters by type only, so values never reach the log."""
+    if executemany:
+        return f"<{len(parameters)} parameter sets>"
+    if isinstance(parameters, dict):
+        return repr({key: type(value).__name__ for key, value in parameters.items()})
+    if isinstance(parameters, (list, tuple)):
+        return repr([type(value).__name__ for value in parameters])
+    return "<redacted>"
+
+
+def instrument_engine(engine: AsyncEngine, slow_query_seconds: float = 0) -> None:
+    """Time every statement run on ``engine``.
+
+    Timings go to the current ``track_queries`` scope, if any; statements
+    slower than ``slow_query_seconds`` (0 disables) are logged with their
+    parameters redacted. Statements that fail count too.
+    """
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.record(statement, elapsed)
+        if slow_query_seconds and elapsed >= slow_query_seconds:
+            logger.warning(
+                "Slow query (%.1f ms): %s parameters=%s",
+                elapsed * 1000,
+                " ".join(statement.split()),
+                redact_parameters(parameters, executemany)
+            )
+
+    def handle_error(exception_context):
+        # after_cursor_execute does not run for a failed statement; record it
+        # here and drop its start time so it cannot pile up on the connection
+        conn = exception_context.connection
+        if conn is None or exception_context.execution_context is None or exception_context.statement is None:
+            return
+        started = conn.info.get("query_started")
+        if not started:
+            return
+        elapsed = time.perf_counter() - started.pop()
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.record(exception_context.statement, elapsed)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", after_cursor_execute)
+    event.listen(engine.sync_engine, "handle_error", handle_error)
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_flush(session, flush_context):
+    session.info["has_writes"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_dml(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["has_writes"] = True
+
+
+def session_has_writes(session: AsyncSession) -> bool:
+    """Whether the session has written, or holds unflushed changes.
+
+    Stays true after commit: later reads in the same session must see the
+    write, so they cannot be answered from another session.
+    """
+    return bool(session.info.get("has_writes") or session.new or session.dirty or session.deleted)
@@ -1,5 +1,6 @@
-from sqlalchemy import Boolean, Column, Integer, String, DateTime, Enum
+from sqlalchemy import Boolean, Column, Integer, Float, String, DateTime, Enum, Text, Index, ForeignKey, func, text
 from sqlalchemy.ext.declarative import declarative_base
+from datetime import datetime
 import enum
 
 Base = declarative_base()
@@ -16,13 +17,82 @@ class UserDB(Base):
     full_name = Column(String)
     hashed_password = Column(String)
     is_active = Column(Boolean, default=True)
-    reset_token = Column(String, nullable=True)
-    reset_token_expires = Column(DateTime, nullable=True)
     role = Column(Enum(UserRole), nullable=False, default=UserRole.CLIENT)
+    # Bumped whenever password, role or active state changes; invalidates
+    # access tokens issued with an older "tv" claim
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
+    # Set on every insert and update; the user's ETag is derived from it
+    updated_at = Column(
+        DateTime,
+        nullable=False,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+        server_default=func.now()
+    )
+
+    __table_args__ = (
+        # Keyset pagination of the admin listing, optionally filtered
+        Index("ix_users_role_id", "role", "id"),
+        Index("ix_users_is_active_id", "is_active", "id"),
+        # Lets "email LIKE 'prefix%'" use an index regardless of collation
+        Index("ix_users_email_pattern", "email", postgresql_ops={"email": "varchar_pattern_ops"}),
+    )
 
 class BlacklistedToken(Base):
     __tablename__ = "blacklisted_tokens"
 
     id = Column(Integer, primary_key=True, index=True)
-    token = Column(String, unique=True, index=True)
-    expires_at = Column(DateTime) 
+    # Token "jti", or the SHA-256 hex digest of tokens issued without one
+    jti = Column(String(64), unique=True, index=True, nullable=False)
+    expires_at = Column(DateTime, index=True)
+
+class PasswordResetToken(Base):
+    __tablename__ = "password_reset_tokens"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    # SHA-256 hex digest of the token sent by email; the token itself is not stored
+    token_hash = Column(String(64), unique=True, index=True, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+class RateLimitBucket(Base):
+    """Token bucket shared by all workers (LOGIN_RATE_LIMIT_BACKEND=database)."""
+    __tablename__ = "rate_limit_buckets"
+
+    # SHA-256 hex digest of "<limit>:<key>", see services.rate_limiter.bucket_key
+    key = Column(String(255), primary_key=True)
+    tokens = Column(Float, nullable=False)
+    # Unix time of the last update; buckets idle long enough are full again
+    updated_at = Column(Float, nullable=False, index=True)
+    # Whether the last hit was admitted
+    admitted = Column(Boolean, nullable=False)
+
+class EmailStatus(enum.Enum):
+    PENDING = "PENDING"
+    SENT = "SENT"
+    DEAD = "DEAD"
+
+class EmailOutbox(Base):
+    __tablename__ = "email_outbox"
+
+    id = Column(Integer, primary_key=True, index=True)
+    to_email = Column(String, nullable=False)
+    subject = Column(String, nullable=False)
+    html_content = Column(Text, nullable=False)
+    text_content = Column(Text, nullable=True)
+    status = Column(Enum(EmailStatus), nullable=False, default=EmailStatus.PENDING)
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    sent_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        # Only pending rows are ever polled by the dispatcher
+        Index(
+            "ix_email_outbox_pending",
+            "next_attempt_at",
+            postgresql_where=text("status = 'PENDING'"),
+        ),
+    )
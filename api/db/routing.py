@@ -0,0 +1,150 @@
+import asyncio
+import itertools
+import logging
+import time
+from sqlalchemy import event, exc, text
+from sqlalchemy.engine import Dialect, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+from .pool_metrics import pool_stats
+
+logger = logging.getLogger(__name__)
+
+
+class Replica:
+    def __init__(self, engine: AsyncEngine):
+        self.engine = engine
+        self.name = make_url(engine.url).render_as_string(hide_password=True)
+        self.ejected_until = 0.0
+        self.ejections = 0
+
+    @property
+    def available(self) -> bool:
+        return self.ejected_until <= time.monotonic()
+
+
+class ReplicaSet:
+    """Read replicas picked round-robin, skipping ejected ones.
+
+    A replica is ejected for ``eject_seconds`` as soon as one of its
+    connections fails (``handle_error``), and by the periodic health probe.
+    Once the window has passed it takes traffic again; the next failure
+    ejects it again.
+    """
+
+    def __init__(self, engines: list[AsyncEngine], eject_seconds: float = 30):
+        self.eject_seconds = eject_seconds
+        self.replicas = [Replica(engine) for engine in engines]
+        self._cycle = itertools.cycle(self.replicas)
+        self.fallbacks = 0
+        for replica in self.replicas:
+            event.listen(replica.engine.sync_engine, "handle_error", self._on_error(replica))
+
+    def _on_error(self, replica: Replica):
+        def handle_error(context):
+            if context.is_disconnect or isinstance(context.sqlalchemy_exception, exc.OperationalError):
+                self.eject(replica)
+        return handle_error
+
+    def eject(self, replica: Replica) -> None:
+        if replica.available:
+            logger.warning("Ejecting read replica %s for %ss", replica.name, self.eject_seconds)
+            replica.ejections += 1
+        replica.ejected_until = time.monotonic() + self.eject_seconds
+
+    def choose(self) -> AsyncEngine | None:
+        """Next available replica, or None to read from the primary."""
+        for _ in range(len(self.replicas)):
+            replica = next(self._cycle)
+            if replica.available:
+                return replica.engine
+        if self.replicas:
+            self.fallbacks += 1
+        return None
+
+    async def probe(self, replica: Replica, timeout: float = 2) -> bool:
+        try:
+            async with asyncio.timeout(timeout):
+                async with replica.engine.connect() as conn:
+                    await conn.execute(text("SELECT 1"))
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.eject(replica)
+            return False
+        replica.ejected_until = 0.0
+        return True
+
+    async def run_health_checks(self, interval_seconds: float) -> None:
+        while True:
+            await asyncio.gather(*(self.probe(replica) for replica in self.replicas))
+            await asyncio.sleep(interval_seconds)
+
+    async def dispose(self) -> None:
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+    def stats(self) -> dict:
+        return {
+            "fallbacks": self.fallbacks,
+            "replicas": [
+                {
+                    "url": replica.name,
+                    "available": replica.available,
+                    "ejections": replica.ejections,
+                    "pool": pool_stats(replica.engine),
+                }
+                for replica in self.replicas
+            ],
+        }
+
+
+class RoutingSession(Session):
+    """Session that sends plain SELECTs to a read replica.
+
+    Everything else (flushes, INSERT/UPDATE/DELETE, SELECT ... FOR UPDATE,
+    raw connections) goes to the primary, and once the session has touched
+    the primary every later statement stays there, so a request reads its
+    own writes. The replica is chosen once per session so one request sees
+    a single snapshot source.
+    """
+
+    def __init__(self, *args, primary: AsyncEngine, replicas: ReplicaSet, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._primary = primary.sync_engine
+        self._replicas = replicas
+        self._replica = None
+        self._sticky_primary = False
+
+    @property
+    def dialect(self):
+        # Replicas run the same database as the primary
+        return self._primary.dialect
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        is_read = (
+            isinstance(clause, Select)
+            and clause._for_update_arg is None
+            and not self._flushing
+        )
+        if not is_read:
+            self._sticky_primary = True
+        if self._sticky_primary:
+            return self._primary
+        if self._replica is None:
+            replica = self._replicas.choose()
+            self._replica = replica.sync_engine if replica is not None else self._primary
+        return self._replica
+
+
+def session_dialect(session) -> Dialect:
+    """Dialect of an (async) session, without routing it.
+
+    ``get_bind()`` with no statement counts as a write for a
+    ``RoutingSession`` and would pin the session to the primary.
+    """
+    sync_session = getattr(session, "sync_session", session)
+    if isinstance(sync_session, RoutingSession):
+        return sync_session.dialect
+    return sync_session.get_bind().dialect
@@ -1,11 +1,35 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from views import user as user_views
 from views import auth as auth_views
-from db.database import init_db
+from views import admin as admin_views
+from db.database import init_db, AsyncSessionLocal, engine, replica_set
+from db.pool_metrics import pool_stats
+from middleware.metrics import MetricsMiddleware
+from middleware.server_timing import ServerTimingMiddleware
+from middleware.profiling import ProfilingMiddleware
+from services.profile_store import profile_store
+from utils.security import password_hasher
+from services.smtp_pool import smtp_pool
+from services.email_dispatcher import EmailDispatcher
+from services.email_templates import email_templates
+from services.principal_cache import principal_cache, token_versions
+from services.revocation_index import revocation_index
+from services.maintenance import run_purge_forever
+from services.rate_limiter import rate_limiter
+from services.single_flight import user_by_id_flight, user_by_email_flight
+from config import settings
+from utils.metrics import mark_process_dead, render_metrics
+from utils.responses import FastJSONResponse
 import asyncio
+import os
 
-app = FastAPI(title="Api ", version="1.0.0", description="boilerplate api project")
+app = FastAPI(
+    title="Api ",
+    version="1.0.0",
+    description="boilerplate api project",
+    default_response_class=FastJSONResponse
+)
 
 # Configure CORS
 app.add_middleware(
@@ -15,16 +39,72 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+if settings.profiling_enabled():
+    app.add_middleware(
+        ProfilingMiddleware,
+        store=profile_store,
+        header=settings.PROFILING_HEADER,
+        sample_rate=settings.PROFILING_SAMPLE_RATE,
+        interval=settings.PROFILING_INTERVAL_SECONDS
+    )
+if settings.SERVER_TIMING_ENABLED:
+    app.add_middleware(ServerTimingMiddleware)
+app.add_middleware(MetricsMiddleware)
+
+background_tasks: list[asyncio.Task] = []
 
 @app.on_event("startup")
 async def startup_event():
     await init_db()
+    email_templates.load_all()
+    if settings.REVOCATION_INDEX_ENABLED:
+        async with AsyncSessionLocal() as session:
+            await revocation_index.sync(session)
+        background_tasks.append(asyncio.create_task(revocation_index.run_forever(AsyncSessionLocal)))
+    if settings.PURGE_ENABLED:
+        background_tasks.append(asyncio.create_task(run_purge_forever(AsyncSessionLocal)))
+    if settings.EMAIL_DISPATCHER_ENABLED:
+        background_tasks.append(asyncio.create_task(EmailDispatcher().run_forever()))
+    if replica_set.replicas:
+        background_tasks.append(asyncio.create_task(
+            replica_set.run_health_checks(settings.REPLICA_HEALTH_CHECK_INTERVAL_SECONDS)
+        ))
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    background_tasks.clear()
+    password_hasher.shutdown()
+    await smtp_pool.close()
+    await replica_set.dispose()
+    mark_process_dead(os.getpid())
 
 # Add health check endpoint
 @app.get("/health")
 def health_check():
-    return {"status": "ok"}
+    return {
+        "status": "ok",
+        "password_hasher": password_hasher.stats(),
+        "principal_cache": principal_cache.stats(),
+        "token_versions": token_versions.stats(),
+        "revocation_index": revocation_index.stats(),
+        "rate_limiter": rate_limiter.stats(),
+        "user_lookups": {
+            "by_id": user_by_id_flight.stats(),
+            "by_email": user_by_email_flight.stats(),
+        },
+        "db_pool": pool_stats(engine),
+        "db_replicas": replica_set.stats(),
+    }
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
 
 # Include routers
 app.include_router(auth_views.router, prefix="/api/v1")
-app.include_router(user_views.router, prefix="/api/v1") 
\ No newline at end of file
+app.include_router(user_views.router, prefix="/api/v1")
+app.include_router(admin_views.router, prefix="/api/v1") 
\ No newline at end of file
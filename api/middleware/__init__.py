@@ -0,0 +1 @@
+# Empty init file 
\ No newline at end of file
@@ -0,0 +1,103 @@
+import time
+from starlette.types import ASGIApp, Receive, Scope, Send
+from db.instrumentation import track_queries
+from utils.metrics import (
+    http_request_db_queries,
+    http_request_db_seconds,
+    http_request_duration_seconds,
+    http_requests_in_flight,
+    http_requests_total,
+)
+
+KNOWN_METHODS = {"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"}
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def route_template(scope: Scope) -> str:
+    """Path template of the route that served the request.
+
+    Included routers may report their route relative to the router prefix,
+    so the prefix is recovered from the concrete path.
+    """
+    route = scope.get("route")
+    if route is None:
+        return UNMATCHED_ROUTE
+    template = route.path
+    try:
+        concrete = route.path_format.format(**scope.get("path_params", {}))
+    except (AttributeError, KeyError):
+        return template
+    path = scope["path"]
+    if path != concrete and path.endswith(concrete):
+        return path[:-len(concrete)] + template
+    return template
+
+
+class _RouteMetrics:
+    """Metric children for one (method, route) pair, resolved once."""
+
+    __slots__ = ("duration", "db_queries", "db_seconds", "method", "route", "by_status")
+
+    def __init__(self, method: str, route: str):
+        self.method = method
+        self.route = route
+        self.duration = http_request_duration_seconds.labels(method, route)
+        self.db_queries = http_request_db_queries.labels(method, route)
+        self.db_seconds = http_request_db_seconds.labels(method, route)
+        self.by_status = {}
+
+    def requests(self, status_code: int):
+        counter = self.by_status.get(status_code)
+        if counter is None:
+            counter = self.by_status[status_code] = http_requests_total.labels(
+                self.method, self.route, str(status_code)
+            )
+        return counter
+
+
+class MetricsMiddleware:
+    """Records latency, status and DB usage of every HTTP request.
+
+    Requests are labelled by route template (``/api/v1/users/{user_id}``),
+    never by raw path, so the number of series stays bounded. Label
+    children are created the first time a route is seen and reused after.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._routes: dict[tuple[str, str], _RouteMetrics] = {}
+
+    def _route_metrics(self, method: str, route: str) -> _RouteMetrics:
+        key = (method, route)
+        metrics = self._routes.get(key)
+        if metrics is None:
+            metrics = self._routes[key] = _RouteMetrics(method, route)
+        return metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_requests_in_flight.inc()
+        started = time.perf_counter()
+        try:
+            with track_queries() as queries:
+                await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            http_requests_in_flight.dec()
+            method = scope["method"] if scope["method"] in KNOWN_METHODS else "OTHER"
+            metrics = self._route_metrics(method, route_template(scope))
+            metrics.duration.observe(elapsed)
+            metrics.requests(status_code).inc()
+            metrics.db_queries.observe(queries.count)
+            metrics.db_seconds.observe(queries.seconds)
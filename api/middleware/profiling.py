@@ -0,0 +1,97 @@
+import logging
+import random
+import time
+from fastapi import HTTPException
+from pyinstrument import Profiler
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from db.database import AsyncSessionLocal
+from db.models import UserRole
+from services.auth_service import AuthService
+from services.profile_store import ProfileStore
+
+logger = logging.getLogger(__name__)
+
+
+class ProfilingMiddleware:
+    """Runs a sampling profiler for selected requests.
+
+    A request is profiled when it carries ``header`` and a bearer token of
+    an admin, or at random with probability ``sample_rate``. Only one
+    request is profiled at a time. Other requests pay for one header scan.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        store: ProfileStore,
+        header: str = "X-Profile",
+        sample_rate: float = 0.0,
+        interval: float = 0.001
+    ):
+        self.app = app
+        self.store = store
+        self.header = header.lower().encode()
+        self.sample_rate = sample_rate
+        self.interval = interval
+        self._active = False
+
+    async def _is_admin(self, scope: Scope) -> bool:
+        authorization = next(
+            (value.decode() for name, value in scope["headers"] if name == b"authorization"),
+            ""
+        )
+        scheme, _, token = authorization.partition(" ")
+        if scheme.lower() != "bearer" or not token:
+            return False
+        async with AsyncSessionLocal() as session:
+            try:
+                user = await AuthService(session).get_current_user(token)
+            except HTTPException:
+                return False
+            except Exception:
+                # Profiling must never fail the request it was asked for
+                logger.exception("Could not check the profiling requester; serving unprofiled")
+                return False
+        return user.role == UserRole.ADMIN
+
+    async def _trigger(self, scope: Scope) -> str | None:
+        if any(name == self.header for name, _ in scope["headers"]):
+            return "header" if await self._is_admin(scope) else None
+        if self.sample_rate and random.random() < self.sample_rate:
+            return "sample"
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self._active:
+            await self.app(scope, receive, send)
+            return
+        trigger = await self._trigger(scope)
+        if trigger is None or self._active:
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        self._active = True
+        profiler = Profiler(interval=self.interval, async_mode="enabled")
+        started = time.perf_counter()
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            session = profiler.stop()
+            self._active = False
+            self.store.add(
+                method=scope["method"],
+                path=scope["path"],
+                status_code=status_code,
+                duration_ms=(time.perf_counter() - started) * 1000,
+                trigger=trigger,
+                session=session
+            )
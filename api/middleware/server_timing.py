@@ -0,0 +1,36 @@
+import time
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from db.instrumentation import track_queries
+
+
+class ServerTimingMiddleware:
+    """Adds a ``Server-Timing`` header with DB time, query count and total time.
+
+    Browsers show it in the network panel next to the request. Values are
+    those reached when the response starts; streamed bodies are not covered.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        with track_queries() as queries:
+
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    total_ms = (time.perf_counter() - started) * 1000
+                    headers = MutableHeaders(scope=message)
+                    headers.append(
+                        "Server-Timing",
+                        f'db;dur={queries.seconds * 1000:.1f};desc="{queries.count} queries", '
+                        f"total;dur={total_ms:.1f}"
+                    )
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,21 @@
+"""add plain text part to email outbox
+
+Revision ID: 004_add_email_outbox_text_content
+Revises: 003_add_email_outbox
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '004_add_email_outbox_text_content'
+down_revision = '003_add_email_outbox'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.add_column('email_outbox', sa.Column('text_content', sa.Text(), nullable=True))
+
+def downgrade() -> None:
+    op.drop_column('email_outbox', 'text_content')
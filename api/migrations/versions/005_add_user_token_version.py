@@ -0,0 +1,21 @@
+"""add user token version
+
+Revision ID: 005_add_user_token_version
+Revises: 004_add_email_outbox_text_content
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '005_add_user_token_version'
+down_revision = '004_add_email_outbox_text_content'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('token_version', sa.Integer(), nullable=False, server_default='0'))
+
+def downgrade() -> None:
+    op.drop_column('users', 'token_version')
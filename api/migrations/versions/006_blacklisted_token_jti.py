@@ -0,0 +1,38 @@
+"""store revoked tokens by jti or digest
+
+Revision ID: 006_blacklisted_token_jti
+Revises: 005_add_user_token_version
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '006_blacklisted_token_jti'
+down_revision = '005_add_user_token_version'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    # Expired rows are useless; drop them before rewriting the rest
+    op.execute("DELETE FROM blacklisted_tokens WHERE expires_at < now()")
+
+    op.add_column('blacklisted_tokens', sa.Column('jti', sa.String(64), nullable=True))
+    # Old rows have no jti; key them by the SHA-256 hex digest of the token
+    op.execute("UPDATE blacklisted_tokens SET jti = encode(sha256(convert_to(token, 'UTF8')), 'hex')")
+    op.alter_column('blacklisted_tokens', 'jti', nullable=False)
+
+    op.drop_index('ix_blacklisted_tokens_token', table_name='blacklisted_tokens')
+    op.drop_column('blacklisted_tokens', 'token')
+    op.create_index('ix_blacklisted_tokens_jti', 'blacklisted_tokens', ['jti'], unique=True)
+    op.create_index('ix_blacklisted_tokens_expires_at', 'blacklisted_tokens', ['expires_at'])
+
+def downgrade() -> None:
+    # Original token strings cannot be recovered from their digests
+    op.drop_index('ix_blacklisted_tokens_expires_at', table_name='blacklisted_tokens')
+    op.drop_index('ix_blacklisted_tokens_jti', table_name='blacklisted_tokens')
+    op.execute("DELETE FROM blacklisted_tokens")
+    op.drop_column('blacklisted_tokens', 'jti')
+    op.add_column('blacklisted_tokens', sa.Column('token', sa.String(), nullable=True))
+    op.create_index('ix_blacklisted_tokens_token', 'blacklisted_tokens', ['token'], unique=True)
@@ -0,0 +1,29 @@
+"""add user listing indexes
+
+Revision ID: 007_add_user_listing_indexes
+Revises: 006_blacklisted_token_jti
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '007_add_user_listing_indexes'
+down_revision = '006_blacklisted_token_jti'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_index('ix_users_role_id', 'users', ['role', 'id'])
+    op.create_index('ix_users_is_active_id', 'users', ['is_active', 'id'])
+    op.create_index(
+        'ix_users_email_pattern',
+        'users',
+        ['email'],
+        postgresql_ops={'email': 'varchar_pattern_ops'},
+    )
+
+def downgrade() -> None:
+    op.drop_index('ix_users_email_pattern', table_name='users')
+    op.drop_index('ix_users_is_active_id', table_name='users')
+    op.drop_index('ix_users_role_id', table_name='users')
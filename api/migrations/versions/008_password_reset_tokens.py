@@ -0,0 +1,49 @@
+"""move password reset tokens to their own table, hashed
+
+Revision ID: 008_password_reset_tokens
+Revises: 007_add_user_listing_indexes
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '008_password_reset_tokens'
+down_revision = '007_add_user_listing_indexes'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table(
+        'password_reset_tokens',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('token_hash', sa.String(64), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_index('ix_password_reset_tokens_token_hash', 'password_reset_tokens', ['token_hash'], unique=True)
+    op.create_index('ix_password_reset_tokens_user_id', 'password_reset_tokens', ['user_id'])
+    op.create_index('ix_password_reset_tokens_expires_at', 'password_reset_tokens', ['expires_at'])
+
+    # Carry over tokens that are still valid, stored as SHA-256 hex digests
+    op.execute(
+        """
+        INSERT INTO password_reset_tokens (user_id, token_hash, expires_at)
+        SELECT id, encode(sha256(convert_to(reset_token, 'UTF8')), 'hex'), reset_token_expires
+        FROM users
+        WHERE reset_token IS NOT NULL AND reset_token_expires > now()
+        """
+    )
+    op.drop_column('users', 'reset_token_expires')
+    op.drop_column('users', 'reset_token')
+
+def downgrade() -> None:
+    # Raw tokens cannot be recovered from their digests; pending resets are lost
+    op.add_column('users', sa.Column('reset_token', sa.String(), nullable=True))
+    op.add_column('users', sa.Column('reset_token_expires', sa.DateTime(), nullable=True))
+    op.drop_index('ix_password_reset_tokens_expires_at', table_name='password_reset_tokens')
+    op.drop_index('ix_password_reset_tokens_user_id', table_name='password_reset_tokens')
+    op.drop_index('ix_password_reset_tokens_token_hash', table_name='password_reset_tokens')
+    op.drop_table('password_reset_tokens')
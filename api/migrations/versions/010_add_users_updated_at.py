@@ -0,0 +1,25 @@
+"""add users updated_at
+
+Revision ID: 010_add_users_updated_at
+Revises: 009_add_rate_limit_buckets
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '010_add_users_updated_at'
+down_revision = '009_add_rate_limit_buckets'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    # Existing rows start at the migration time
+    op.add_column(
+        'users',
+        sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.func.now())
+    )
+
+def downgrade() -> None:
+    op.drop_column('users', 'updated_at')
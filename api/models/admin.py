@@ -0,0 +1,18 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import List, Literal
+
+class ProfileSummary(BaseModel):
+    id: int
+    method: str
+    path: str
+    status_code: int
+    duration_ms: float
+    trigger: Literal["header", "sample"]
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class ProfileList(BaseModel):
+    items: List[ProfileSummary]
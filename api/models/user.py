@@ -1,8 +1,9 @@
-from pydantic import BaseModel, EmailStr
-from typing import Optional
+from pydantic import BaseModel, EmailStr, Field
+from typing import List, Literal, Optional
 from datetime import datetime
 from sqlalchemy import Column, Integer, String, Boolean, DateTime
 from db.models import UserRole
+from config import settings
 
 class UserBase(BaseModel):
     email: EmailStr
@@ -16,22 +17,20 @@ class UserInDB(UserBase):
     id: int
     is_active: bool = True
     hashed_password: str
-    reset_token: Optional[str] = None
-    reset_token_expires: Optional[datetime] = None
     role: UserRole = UserRole.CLIENT
+    token_version: int = 0
+    updated_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
 
     __tablename__ = "users"
-    
-    reset_token = Column(String, nullable=True)
-    reset_token_expires = Column(DateTime, nullable=True)
 
 class User(UserBase):
     id: int
     is_active: bool = True
     role: UserRole = UserRole.CLIENT
+    updated_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True 
@@ -39,3 +38,28 @@ class User(UserBase):
 class UserUpdate(UserBase):
     full_name: Optional[str] = None
     email: Optional[EmailStr] = None
+
+class UserPage(BaseModel):
+    items: List[User]
+    next_cursor: Optional[str] = None
+
+class UserBatchRequest(BaseModel):
+    # Checked before the items are validated
+    ids: List[int] = Field(max_length=settings.USER_BATCH_MAX_SIZE)
+
+class UserBatch(BaseModel):
+    items: List[User]
+    missing: List[int]
+
+class BulkUserResult(BaseModel):
+    row: int
+    email: Optional[str] = None
+    status: Literal["created", "duplicate", "invalid"]
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+class BulkUserReport(BaseModel):
+    created: int
+    duplicates: int
+    invalid: int
+    results: List[BulkUserResult]
@@ -0,0 +1,6 @@
+import asyncio
+from services.email_dispatcher import EmailDispatcher
+
+if __name__ == "__main__":
+    print("Starting email dispatcher...")
+    asyncio.run(EmailDispatcher().run_forever())
@@ -6,15 +6,16 @@ from models.auth import Token, TokenData
 from models.user import User, UserInDB
 from services.user_service import UserService
 from services.token_blacklist import TokenBlacklistService
-from utils.security import verify_password, get_password_hash
+from utils.security import password_hasher
 from config import settings
 from models.user import User
 import secrets
-from services.mail_service import MailService
+from services.email_outbox import EmailOutboxService
+from services.password_reset import PasswordResetService
 from sqlalchemy import update
 from db.models import UserDB
-import os
-from string import Template
+from services.email_templates import email_templates
+from services.principal_cache import principal_cache, token_versions
 
 
 class AuthService:
@@ -23,18 +24,25 @@ class AuthService:
         self.user_service = UserService(db)
         self.token_blacklist = TokenBlacklistService(db)
 
-    async def authenticate_user(self, email: str, password: str) -> User | None:
+    async def authenticate_user(self, email: str, password: str) -> UserInDB | None:
         user = await self.user_service.get_user_by_email(email)
         if not user:
             return None
-        if not verify_password(password, user.hashed_password):
+        if not await password_hasher.verify(password, user.hashed_password):
             return None
-        return User(
-            id=user.id,
-            email=user.email,
-            full_name=user.full_name,
-            is_active=user.is_active
-        )
+        return user
+
+    def build_token_claims(self, user: UserInDB) -> dict:
+        claims = {"sub": user.email}
+        if settings.JWT_EMBED_CLAIMS:
+            claims.update({
+                "uid": user.id,
+                "role": user.role.value,
+                "is_active": user.is_active,
+                "tv": user.token_version,
+            })
+            token_versions.put(user.id, user.token_version)
+        return claims
 
     def create_access_token(self, data: dict, expires_delta: timedelta | None = None) -> str:
         to_encode = data.copy()
@@ -43,6 +51,7 @@ class AuthService:
         else:
             expire = datetime.utcnow() + timedelta(minutes=15)
         to_encode.update({"exp": expire})
+        to_encode.setdefault("jti", secrets.token_hex(16))
         encoded_jwt = jwt.encode(
             to_encode, 
             settings.SECRET_KEY, 
@@ -57,14 +66,6 @@ class AuthService:
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-        # Check if token is blacklisted
-        if await self.token_blacklist.is_token_blacklisted(token):
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Token has been revoked",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-
         try:
             payload = jwt.decode(
                 token, 
@@ -77,11 +78,81 @@ class AuthService:
             token_data = TokenData(email=email)
         except JWTError:
             raise credentials_exception
+
+        # Check if token is blacklisted
+        if await self.token_blacklist.is_token_blacklisted(token, payload):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token has been revoked",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+
+        if settings.JWT_EMBED_CLAIMS and "tv" in payload:
+            return await self._get_user_from_claims(payload, credentials_exception)
         
-        user = await self.user_service.get_user_by_email(email=token_data.email)
-        if user is None:
+        user = principal_cache.get_by_email(token_data.email)
+        if user is not None:
+            return user
+
+        db_user = await self.user_service.get_user_by_email(email=token_data.email)
+        if db_user is None:
             raise credentials_exception
-        return user 
+        user = self._to_principal(db_user)
+        principal_cache.put(user)
+        return user
+
+    @staticmethod
+    def _to_principal(db_user: UserInDB) -> User:
+        return User(
+            id=db_user.id,
+            email=db_user.email,
+            full_name=db_user.full_name,
+            is_active=db_user.is_active,
+            role=db_user.role,
+            updated_at=db_user.updated_at
+        )
+
+    async def _get_user_from_claims(self, payload: dict, credentials_exception: HTTPException) -> User:
+        """Fast path for tokens with embedded claims.
+
+        The token is valid as long as its ``tv`` claim matches the user's
+        current token version, which is served from an in-process map. The
+        principal itself comes from the principal cache, so a warm request
+        touches no database row at all; when both caches are cold, one row
+        fills both.
+        """
+        user_id = payload.get("uid")
+        if not isinstance(user_id, int):
+            raise credentials_exception
+
+        current_version = token_versions.get(user_id)
+        user = principal_cache.get_by_id(user_id)
+        if current_version is None and user is None:
+            db_user = await self.user_service.get_user_in_db(user_id)
+            if db_user is None:
+                raise credentials_exception
+            current_version = db_user.token_version
+            token_versions.put(user_id, current_version)
+            user = self._to_principal(db_user)
+            principal_cache.put(user)
+        elif current_version is None:
+            current_version = await self.user_service.get_token_version(user_id)
+            if current_version is None:
+                raise credentials_exception
+            token_versions.put(user_id, current_version)
+        if payload["tv"] != current_version:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token is no longer valid",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+
+        if user is None:
+            user = await self.user_service.get_user(user_id)
+            if user is None:
+                raise credentials_exception
+            principal_cache.put(user)
+        return user
 
     async def logout(self, token: str) -> None:
         await self.token_blacklist.blacklist_token(token) 
@@ -89,7 +160,14 @@ class AuthService:
     async def refresh_token(self, token: str) -> Token:
         user = await self.get_current_user(token)
         await self.token_blacklist.blacklist_token(token) 
-        new_token = self.create_access_token(data={"sub": user.email})
+        db_user = await self.user_service.get_user_by_email(user.email)
+        if db_user is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Could not validate credentials",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        new_token = self.create_access_token(data=self.build_token_claims(db_user))
         return Token(access_token=new_token, token_type="bearer")
 
     async def create_password_reset_token(self, email: str) -> bool:
@@ -97,69 +175,61 @@ class AuthService:
         if not user:
             return False
         
-        # Generate reset token
-        reset_token = secrets.token_urlsafe(32)
-        expiration = datetime.utcnow() + timedelta(hours=24)
+        # Generate reset token; only its digest is stored
+        reset_token = await PasswordResetService(self.db).create_token(user.id)
         
-        # Store reset token in database
-        await self.user_service.update_user_reset_token(
-            email=email,
-            reset_token=reset_token,
-            expires=expiration
-        )
-
-        # Read the email template
-        template_path = os.path.join('email-templates', 'auth', 'reset_password.html')
-        with open(template_path, 'r') as file:
-            template = Template(file.read())
-
-        # Format the template with user data
+        # Render the preloaded template with user data
         reset_link = f"{settings.DOMAIN_NAME}/reset-password?token={reset_token}"
-        html_content = template.safe_substitute(
-            app_name=settings.APP_NAME,
+        content = email_templates.render(
+            "auth/reset_password",
             full_name=user.full_name,
             email=user.email,
             reset_link=reset_link
         )
         
-        # Send email
-        mail_service = MailService()
-        await mail_service.send_email(
+        # Queue the email; it is committed together with the reset token
+        EmailOutboxService(self.db).enqueue(
             to_email=email,
             subject=f"{settings.APP_NAME} - Password Reset Request",
-            html_content=html_content
+            html_content=content.html,
+            text_content=content.text
         )
+        await self.db.commit()
         
         return True
 
     async def confirm_password_reset(self, token: str, new_password: str) -> bool:
-        """Confirm password reset and update the user's password."""
-        user = await self.user_service.get_user_by_reset_token(token)
-        
-        if not user:
+        """Confirm password reset and update the user's password.
+
+        The token is consumed with one indexed DELETE ... RETURNING, then
+        the user row is updated by primary key in the same transaction.
+        The password is hashed only once the token has proved valid, so
+        forged tokens cannot tie up the hasher.
+        """
+        user_id = await PasswordResetService(self.db).consume_token(token)
+        if user_id is None:
+            await self.db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid or expired password reset token"
             )
-            
-        # Check if token is expired
-        if user.reset_token_expires < datetime.utcnow():
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Password reset token has expired"
-            )
-            
-        # Update password and clear reset token
+        try:
+            hashed_password = await password_hasher.hash(new_password)
+        except BaseException:
+            # Give the token back, e.g. when the hasher is busy
+            await self.db.rollback()
+            raise
         query = (
             update(UserDB)
-            .where(UserDB.reset_token == token)
+            .where(UserDB.id == user_id)
             .values(
-                hashed_password=get_password_hash(new_password),
-                reset_token=None,
-                reset_token_expires=None
+                hashed_password=hashed_password,
+                token_version=UserDB.token_version + 1
             )
         )
         await self.db.execute(query)
         await self.db.commit()
+        principal_cache.invalidate(user_id)
+        token_versions.invalidate(user_id)
         
         return True
@@ -0,0 +1,141 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from sqlalchemy import select
+from db.database import AsyncSessionLocal
+from db.models import EmailOutbox, EmailStatus
+from services.mail_service import MailService
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+class EmailDispatcher:
+    """Drains the email outbox in batches.
+
+    A batch is claimed with ``SELECT ... FOR UPDATE SKIP LOCKED`` and
+    leased by moving ``next_attempt_at`` ``lease_seconds`` ahead, in a short
+    transaction that is committed before anything is sent. Several
+    dispatchers (app workers or the standalone script) can therefore run
+    side by side without sending the same email twice, and no row lock is
+    held while SMTP is slow. Results are written in a second transaction.
+    Failed sends are retried with exponential backoff; after
+    ``max_attempts`` the row is marked DEAD and left in the table for
+    inspection. A row whose lease runs out (its dispatcher died mid-send)
+    is claimed again and counts as an attempt.
+    """
+
+    def __init__(
+        self,
+        session_factory=AsyncSessionLocal,
+        batch_size: int = settings.EMAIL_DISPATCH_BATCH_SIZE,
+        interval_seconds: float = settings.EMAIL_DISPATCH_INTERVAL_SECONDS,
+        max_attempts: int = settings.EMAIL_MAX_ATTEMPTS,
+        retry_base_seconds: float = settings.EMAIL_RETRY_BASE_SECONDS,
+        retry_max_seconds: float = settings.EMAIL_RETRY_MAX_SECONDS,
+        lease_seconds: float = settings.EMAIL_LEASE_SECONDS,
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.interval_seconds = interval_seconds
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self.lease_seconds = lease_seconds
+        self.mail_service = MailService()
+
+    def _backoff(self, attempts: int) -> timedelta:
+        delay = self.retry_base_seconds * 2 ** (attempts - 1)
+        return timedelta(seconds=min(delay, self.retry_max_seconds))
+
+    async def dispatch_batch(self) -> int:
+        """Send one batch of due emails. Returns the number of rows processed."""
+        now = datetime.utcnow()
+        lease_until = now + timedelta(seconds=self.lease_seconds)
+
+        # Any failure is recorded against its row, so a message that can
+        # never be sent is retried with backoff and dead-lettered instead
+        # of blocking the head of the outbox
+        async with self.session_factory() as session:
+            query = (
+                select(EmailOutbox)
+                .where(
+                    EmailOutbox.status == EmailStatus.PENDING,
+                    EmailOutbox.next_attempt_at <= now
+                )
+                .order_by(EmailOutbox.next_attempt_at)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            result = await session.execute(query)
+            emails = result.scalars().all()
+            if not emails:
+                return 0
+
+            errors: dict[int, Exception | None] = {}
+            messages = {}
+            for email in emails:
+                if email.attempts >= self.max_attempts:
+                    # Every earlier lease expired without a result
+                    email.status = EmailStatus.DEAD
+                    email.last_error = email.last_error or "Lease expired before the send was recorded"
+                    logger.error("Giving up on email %s to %s: %s", email.id, email.to_email, email.last_error)
+                    continue
+                email.attempts += 1
+                email.next_attempt_at = lease_until
+                try:
+                    messages[email.id] = self.mail_service.build_message(
+                        to_email=email.to_email,
+                        subject=email.subject,
+                        html_content=email.html_content,
+                        text_content=email.text_content
+                    )
+                except Exception as e:
+                    errors[email.id] = e
+            await session.commit()
+
+        if messages:
+            try:
+                results = await self.mail_service.send_messages(list(messages.values()))
+            except Exception as e:
+                results = [e] * len(messages)
+            errors.update(zip(messages, results))
+        if not errors:
+            return len(emails)
+
+        async with self.session_factory() as session:
+            # Rows whose lease ran out meanwhile belong to another dispatcher
+            query = select(EmailOutbox).where(
+                EmailOutbox.id.in_(list(errors)),
+                EmailOutbox.status == EmailStatus.PENDING,
+                EmailOutbox.next_attempt_at == lease_until
+            )
+            result = await session.execute(query)
+            now = datetime.utcnow()
+            for email in result.scalars():
+                error = errors[email.id]
+                if error is None:
+                    email.status = EmailStatus.SENT
+                    email.sent_at = now
+                    email.last_error = None
+                elif email.attempts >= self.max_attempts:
+                    email.status = EmailStatus.DEAD
+                    email.last_error = str(error)
+                    logger.error("Giving up on email %s to %s: %s", email.id, email.to_email, error)
+                else:
+                    email.next_attempt_at = now + self._backoff(email.attempts)
+                    email.last_error = str(error)
+            await session.commit()
+        return len(emails)
+
+    async def run_forever(self) -> None:
+        while True:
+            try:
+                processed = await self.dispatch_batch()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Email dispatch failed")
+                processed = 0
+            # Keep draining while there is a backlog
+            if processed < self.batch_size:
+                await asyncio.sleep(self.interval_seconds)
@@ -0,0 +1,38 @@
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.models import EmailOutbox
+
+class EmailOutboxService:
+    """Queues emails in the ``email_outbox`` table.
+
+    Messages are only added to the session, so they are committed (or rolled
+    back) together with the business change that triggered them. Delivery is
+    handled later by ``EmailDispatcher``.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    def enqueue(
+        self,
+        to_email: str,
+        subject: str,
+        html_content: str,
+        text_content: str | None = None
+    ) -> EmailOutbox:
+        email = EmailOutbox(
+            to_email=to_email,
+            subject=subject,
+            html_content=html_content,
+            text_content=text_content
+        )
+        self.db.add(email)
+        return email
+
+    async def enqueue_many(self, emails: list[dict]) -> None:
+        """Queue many emails with one batched INSERT in the current transaction.
+
+        Each dict holds the ``enqueue`` arguments.
+        """
+        if emails:
+            await self.db.execute(insert(EmailOutbox), emails)
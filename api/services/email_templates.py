@@ -0,0 +1,162 @@
+import os
+import re
+from html.parser import HTMLParser
+from pathlib import Path
+from string import Template
+from typing import Dict, List, NamedTuple, Tuple
+from config import settings
+
+TEMPLATES_DIR = Path(__file__).resolve().parent.parent / "email-templates"
+
+
+class RenderedEmail(NamedTuple):
+    html: str
+    text: str
+
+
+class CompiledTemplate:
+    """A ``string.Template`` pre-split into literal chunks and placeholders.
+
+    Placeholders whose value is known at compile time (``static``) are
+    folded into the literal chunks, so rendering only joins the remaining
+    per-message values. Unknown placeholders are left untouched, like
+    ``Template.safe_substitute``.
+    """
+
+    def __init__(self, source: str, static: Dict[str, str]):
+        self.segments: List[Tuple[str, str | None, str]] = self._compile(source, static)
+
+    @staticmethod
+    def _compile(source: str, static: Dict[str, str]) -> List[Tuple[str, str | None, str]]:
+        segments: List[Tuple[str, str | None, str]] = []
+        literal: List[str] = []
+        position = 0
+        for match in Template.pattern.finditer(source):
+            literal.append(source[position:match.start()])
+            position = match.end()
+            name = match.group("named") or match.group("braced")
+            if match.group("escaped") is not None:
+                literal.append("$")
+            elif name is None:
+                literal.append(match.group(0))
+            elif name in static:
+                literal.append(str(static[name]))
+            else:
+                segments.append(("".join(literal), name, match.group(0)))
+                literal = []
+        literal.append(source[position:])
+        segments.append(("".join(literal), None, ""))
+        return segments
+
+    def render(self, **values: str) -> str:
+        parts = []
+        for literal, name, placeholder in self.segments:
+            parts.append(literal)
+            if name is not None:
+                parts.append(str(values[name]) if name in values else placeholder)
+        return "".join(parts)
+
+
+class _TextExtractor(HTMLParser):
+    """Builds a readable plain-text version of an HTML email."""
+
+    BLOCK_TAGS = {"p", "div", "br", "h1", "h2", "h3", "h4", "tr", "li", "table"}
+    SKIP_TAGS = {"head", "style", "script", "title"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: List[str] = []
+        self._skip = 0
+        self._links: List[Tuple[str | None, int]] = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self._skip += 1
+        elif tag in self.BLOCK_TAGS:
+            self.parts.append("\n")
+        if tag == "a":
+            self._links.append((dict(attrs).get("href"), len(self.parts)))
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS:
+            self._skip = max(self._skip - 1, 0)
+        elif tag in self.BLOCK_TAGS and tag != "br":
+            self.parts.append("\n")
+        if tag == "a" and self._links:
+            href, start = self._links.pop()
+            label = re.sub(r"\s+", " ", "".join(self.parts[start:])).strip()
+            self.parts[start:] = [label]
+            if href and href != label:
+                self.parts.append(f" ({href})")
+
+    def handle_data(self, data):
+        if not self._skip:
+            self.parts.append(data)
+
+    def text(self) -> str:
+        raw = "".join(self.parts)
+        lines = [re.sub(r"\s+", " ", line).strip() for line in raw.split("\n")]
+        text = "\n".join(lines)
+        return re.sub(r"\n{3,}", "\n\n", text).strip() + "\n"
+
+
+def html_to_text(html: str) -> str:
+    extractor = _TextExtractor()
+    extractor.feed(html)
+    extractor.close()
+    return extractor.text()
+
+
+class EmailTemplate:
+    def __init__(self, path: Path, static: Dict[str, str]):
+        self.path = path
+        self.mtime = os.stat(path).st_mtime
+        source = path.read_text()
+        self.html = CompiledTemplate(source, static)
+        self.text = CompiledTemplate(html_to_text(source), static)
+
+    def render(self, **values: str) -> RenderedEmail:
+        return RenderedEmail(html=self.html.render(**values), text=self.text.render(**values))
+
+
+class EmailTemplateRegistry:
+    """Loads and compiles every template under ``email-templates/`` once.
+
+    Templates are addressed by their path without extension, e.g.
+    ``"auth/new_account"``. With ``auto_reload`` enabled (DEBUG), a template
+    is recompiled when its file's mtime changes.
+    """
+
+    def __init__(self, directory: Path = TEMPLATES_DIR, static: Dict[str, str] | None = None, auto_reload: bool = False):
+        self.directory = directory
+        self.static = static or {}
+        self.auto_reload = auto_reload
+        self._templates: Dict[str, EmailTemplate] = {}
+
+    def load_all(self) -> None:
+        for path in sorted(self.directory.rglob("*.html")):
+            name = path.relative_to(self.directory).with_suffix("").as_posix()
+            self._templates[name] = EmailTemplate(path, self.static)
+
+    def get(self, name: str) -> EmailTemplate:
+        template = self._templates.get(name)
+        if template is None:
+            template = EmailTemplate(self.directory / f"{name}.html", self.static)
+            self._templates[name] = template
+        elif self.auto_reload and os.stat(template.path).st_mtime != template.mtime:
+            template = EmailTemplate(template.path, self.static)
+            self._templates[name] = template
+        return template
+
+    def render(self, name: str, **values: str) -> RenderedEmail:
+        return self.get(name).render(**values)
+
+
+email_templates = EmailTemplateRegistry(
+    static={
+        "app_name": settings.APP_NAME,
+        "domain_name": settings.DOMAIN_NAME,
+        "login_url": f"{settings.DOMAIN_NAME}/login",
+    },
+    auto_reload=settings.DEBUG,
+)
@@ -1,27 +1,43 @@
-import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from typing import List
 from config import settings
+from services.smtp_pool import smtp_pool
+
 class MailService:
     def __init__(self):
-        self.smtp_host = settings.SMTP_HOST
-        self.smtp_port = settings.SMTP_PORT
         self.sender_email = settings.SENDER_EMAIL
+        self.pool = smtp_pool
 
-    async def send_email(
+    def build_message(
         self,
         to_email: str,
         subject: str,
-        html_content: str
-    ) -> None:
+        html_content: str,
+        text_content: str | None = None
+    ) -> MIMEMultipart:
         message = MIMEMultipart("alternative")
         message["Subject"] = subject
         message["From"] = self.sender_email
         message["To"] = to_email
 
+        # Clients show the last alternative they support, so plain text goes first
+        if text_content is not None:
+            message.attach(MIMEText(text_content, "plain"))
         html_part = MIMEText(html_content, "html")
         message.attach(html_part)
+        return message
+
+    async def send_email(
+        self,
+        to_email: str,
+        subject: str,
+        html_content: str,
+        text_content: str | None = None
+    ) -> None:
+        message = self.build_message(to_email, subject, html_content, text_content)
+        await self.pool.send(message)
 
-        with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
-            server.send_message(message) 
\ No newline at end of file
+    async def send_messages(self, messages: List[MIMEMultipart]) -> List[Exception | None]:
+        """Send prepared messages over a single pooled SMTP session."""
+        return await self.pool.send_many(messages)
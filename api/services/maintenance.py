@@ -0,0 +1,40 @@
+import asyncio
+import logging
+from services.token_blacklist import TokenBlacklistService
+from services.password_reset import PasswordResetService
+from services.rate_limiter import DatabaseBucketStore, rate_limiter, login_ip_limit, login_email_limit
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+async def purge_expired_rows(session_factory) -> None:
+    """Delete expired rows from bookkeeping tables, batch by batch."""
+    async with session_factory() as session:
+        removed = await TokenBlacklistService(session).cleanup_expired_tokens(
+            batch_size=settings.PURGE_BATCH_SIZE
+        )
+        if removed:
+            logger.info("Purged %s expired blacklisted tokens", removed)
+        removed = await PasswordResetService(session).cleanup_expired_tokens(
+            batch_size=settings.PURGE_BATCH_SIZE
+        )
+        if removed:
+            logger.info("Purged %s expired password reset tokens", removed)
+        if isinstance(rate_limiter.store, DatabaseBucketStore):
+            removed = await rate_limiter.store.cleanup_idle_buckets(
+                session,
+                idle_seconds=max(login_ip_limit.refill_seconds, login_email_limit.refill_seconds),
+                batch_size=settings.PURGE_BATCH_SIZE
+            )
+            if removed:
+                logger.info("Purged %s idle rate limit buckets", removed)
+
+async def run_purge_forever(session_factory) -> None:
+    while True:
+        try:
+            await purge_expired_rows(session_factory)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Expired row purge failed")
+        await asyncio.sleep(settings.PURGE_INTERVAL_SECONDS)
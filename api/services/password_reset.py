@@ -0,0 +1,64 @@
+import hashlib
+import secrets
+from datetime import datetime, timedelta
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete
+from db.models import PasswordResetToken
+from db.batching import delete_in_batches
+
+def hash_reset_token(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+class PasswordResetService:
+    """Password reset tokens, stored by SHA-256 digest.
+
+    A leaked table does not reveal usable tokens, and every lookup is an
+    equality match on the unique ``token_hash`` index.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create_token(self, user_id: int, lifetime: timedelta = timedelta(hours=24)) -> str:
+        """Issue a new token for ``user_id``, replacing any earlier one.
+
+        The caller commits, so the token can be stored together with the
+        email that carries it.
+        """
+        token = secrets.token_urlsafe(32)
+        await self.db.execute(delete(PasswordResetToken).where(PasswordResetToken.user_id == user_id))
+        self.db.add(PasswordResetToken(
+            user_id=user_id,
+            token_hash=hash_reset_token(token),
+            expires_at=datetime.utcnow() + lifetime
+        ))
+        return token
+
+    async def consume_token(self, token: str) -> int | None:
+        """Delete a valid token and return its user id, or None.
+
+        A single indexed DELETE ... RETURNING, so a token can only ever be
+        used once even by concurrent requests. Not committed here.
+        """
+        query = (
+            delete(PasswordResetToken)
+            .where(
+                PasswordResetToken.token_hash == hash_reset_token(token),
+                PasswordResetToken.expires_at >= datetime.utcnow()
+            )
+            .returning(PasswordResetToken.user_id)
+        )
+        result = await self.db.execute(query)
+        return result.scalar_one_or_none()
+
+    async def cleanup_expired_tokens(self, batch_size: int = 1000) -> int:
+        """Remove expired tokens in small batches, one transaction each.
+
+        Returns the number of rows removed.
+        """
+        return await delete_in_batches(
+            self.db,
+            PasswordResetToken.id,
+            PasswordResetToken.expires_at < datetime.utcnow(),
+            batch_size=batch_size
+        )
@@ -0,0 +1,133 @@
+import time
+from collections import OrderedDict
+from typing import Dict, Tuple
+from models.user import User
+from config import settings
+
+
+class PrincipalCache:
+    """Bounded TTL + LRU cache of authenticated users.
+
+    Entries are keyed by user id, with a secondary email index so tokens
+    carrying either identifier resolve without a database round trip.
+    The cache is per process: writes in ``UserService`` invalidate entries
+    explicitly, and the TTL bounds how long other workers may serve a stale
+    principal.
+    """
+
+    def __init__(self, maxsize: int = 10000, ttl_seconds: float = 30):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[int, Tuple[float, User]]" = OrderedDict()
+        self._email_index: Dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get_by_id(self, user_id: int) -> User | None:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, user = entry
+        if expires_at < time.monotonic():
+            self._remove(user_id)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(user_id)
+        self.hits += 1
+        return user
+
+    def get_by_email(self, email: str) -> User | None:
+        user_id = self._email_index.get(email)
+        if user_id is None:
+            self.misses += 1
+            return None
+        return self.get_by_id(user_id)
+
+    def put(self, user: User) -> None:
+        if self.maxsize <= 0:
+            return
+        self._remove(user.id)
+        self._entries[user.id] = (time.monotonic() + self.ttl_seconds, user)
+        self._email_index[user.email] = user.id
+        while len(self._entries) > self.maxsize:
+            oldest_id = next(iter(self._entries))
+            self._remove(oldest_id)
+
+    def invalidate(self, user_id: int) -> None:
+        self._remove(user_id)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._email_index.clear()
+
+    def _remove(self, user_id: int) -> None:
+        entry = self._entries.pop(user_id, None)
+        if entry is not None:
+            self._email_index.pop(entry[1].email, None)
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+class TokenVersionCache:
+    """Bounded TTL + LRU map of user id to current ``token_version``.
+
+    Used by the embedded-claims JWT mode: a token is only accepted when its
+    ``tv`` claim matches the user's current version.
+    """
+
+    def __init__(self, maxsize: int = 100000, ttl_seconds: float = 30):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[int, Tuple[float, int]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: int) -> int | None:
+        entry = self._entries.get(user_id)
+        if entry is None or entry[0] < time.monotonic():
+            self._entries.pop(user_id, None)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(user_id)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, user_id: int, version: int) -> None:
+        if self.maxsize <= 0:
+            return
+        self._entries[user_id] = (time.monotonic() + self.ttl_seconds, version)
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+principal_cache = PrincipalCache(
+    maxsize=settings.PRINCIPAL_CACHE_SIZE,
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+token_versions = TokenVersionCache(
+    maxsize=settings.TOKEN_VERSION_CACHE_SIZE,
+    ttl_seconds=settings.TOKEN_VERSION_CACHE_TTL_SECONDS,
+)
@@ -0,0 +1,64 @@
+import itertools
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from pyinstrument.renderers import HTMLRenderer, SpeedscopeRenderer
+from pyinstrument.session import Session
+from config import settings
+
+
+@dataclass
+class StoredProfile:
+    id: int
+    method: str
+    path: str
+    status_code: int
+    duration_ms: float
+    trigger: str
+    created_at: datetime
+    session: Session
+
+
+class ProfileStore:
+    """Most recent request profiles, kept in memory.
+
+    Only ``maxlen`` profiles are kept; older ones are dropped as new ones
+    arrive. Profiles are rendered when they are fetched, not when stored.
+    """
+
+    def __init__(self, maxlen: int = 20):
+        self._profiles: deque[StoredProfile] = deque(maxlen=maxlen)
+        self._ids = itertools.count(1)
+
+    def add(self, method: str, path: str, status_code: int, duration_ms: float, trigger: str, session: Session) -> StoredProfile:
+        profile = StoredProfile(
+            id=next(self._ids),
+            method=method,
+            path=path,
+            status_code=status_code,
+            duration_ms=duration_ms,
+            trigger=trigger,
+            created_at=datetime.utcnow(),
+            session=session
+        )
+        self._profiles.append(profile)
+        return profile
+
+    def list(self) -> list[StoredProfile]:
+        return list(reversed(self._profiles))
+
+    def get(self, profile_id: int) -> StoredProfile | None:
+        for profile in self._profiles:
+            if profile.id == profile_id:
+                return profile
+        return None
+
+    def render(self, profile: StoredProfile, format: str) -> str:
+        renderer = HTMLRenderer() if format == "html" else SpeedscopeRenderer()
+        return renderer.render(profile.session)
+
+    def clear(self) -> None:
+        self._profiles.clear()
+
+
+profile_store = ProfileStore(maxlen=settings.PROFILING_BUFFER_SIZE)
@@ -0,0 +1,164 @@
+import hashlib
+import math
+import time
+from collections import OrderedDict
+from typing import Tuple
+from fastapi import HTTPException, status
+from sqlalchemy import case, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.batching import delete_in_batches
+from db.database import AsyncSessionLocal
+from db.models import RateLimitBucket
+from utils.metrics import rate_limit_decisions_total
+from config import settings
+
+
+class RateLimit:
+    """A token bucket: ``burst`` hits at once, refilled at ``per_minute``."""
+
+    def __init__(self, name: str, burst: int, per_minute: float):
+        self.name = name
+        self.capacity = float(burst)
+        self.per_second = per_minute / 60
+        # Metric children, resolved once
+        self.admitted = rate_limit_decisions_total.labels(name, "admitted")
+        self.rejected = rate_limit_decisions_total.labels(name, "rejected")
+
+    @property
+    def refill_seconds(self) -> float:
+        """Time for an empty bucket to become full again."""
+        return self.capacity / self.per_second
+
+    def retry_after(self, tokens: float) -> float:
+        return (1 - tokens) / self.per_second
+
+
+class MemoryBucketStore:
+    """Token buckets of this process, at most ``max_keys`` of them.
+
+    Buckets are kept in LRU order; when the store is full the least
+    recently hit bucket is dropped, which is equivalent to it refilling.
+    """
+
+    def __init__(self, max_keys: int = 50000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self.evictions = 0
+
+    async def hit(self, key: str, limit: RateLimit) -> float:
+        """Take one token; returns 0 if admitted, else seconds until one is available."""
+        now = time.monotonic()
+        entry = self._buckets.pop(key, None)
+        if entry is None:
+            tokens = limit.capacity
+        else:
+            tokens = min(limit.capacity, entry[0] + (now - entry[1]) * limit.per_second)
+        retry_after = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            retry_after = limit.retry_after(tokens)
+        self._buckets[key] = (tokens, now)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+            self.evictions += 1
+        return retry_after
+
+    def stats(self) -> dict:
+        return {"backend": "memory", "size": len(self._buckets), "max_keys": self.max_keys, "evictions": self.evictions}
+
+
+def bucket_key(key: str) -> str:
+    """Fixed-width storage key: SHA-256 hex digest of ``limit:key``.
+
+    Keys embed client input (an email can be 254 characters), which must
+    neither overflow the column nor be stored in clear.
+    """
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+class DatabaseBucketStore:
+    """Token buckets in ``rate_limit_buckets``, shared by every worker.
+
+    Each hit is one atomic upsert that refills, takes a token if there is
+    one and returns the outcome, in its own short transaction. Rows are
+    keyed by ``bucket_key``.
+    """
+
+    def __init__(self, session_factory):
+        self.session_factory = session_factory
+
+    async def hit(self, key: str, limit: RateLimit) -> float:
+        now = time.time()
+        async with self.session_factory() as session:
+            postgres = session.get_bind().dialect.name == "postgresql"
+            insert = pg_insert if postgres else sqlite_insert
+            least = func.least if postgres else func.min
+            refilled = least(
+                limit.capacity,
+                RateLimitBucket.tokens + (now - RateLimitBucket.updated_at) * limit.per_second
+            )
+            query = (
+                insert(RateLimitBucket)
+                .values(key=bucket_key(key), tokens=limit.capacity - 1, updated_at=now, admitted=True)
+                .on_conflict_do_update(
+                    index_elements=[RateLimitBucket.key],
+                    set_={
+                        "tokens": case((refilled >= 1, refilled - 1), else_=refilled),
+                        "updated_at": now,
+                        "admitted": refilled >= 1,
+                    }
+                )
+                .returning(RateLimitBucket.tokens, RateLimitBucket.admitted)
+            )
+            tokens, admitted = (await session.execute(query)).one()
+            await session.commit()
+        return 0.0 if admitted else limit.retry_after(tokens)
+
+    async def cleanup_idle_buckets(self, db: AsyncSession, idle_seconds: float, batch_size: int = 1000) -> int:
+        """Delete buckets untouched for ``idle_seconds`` (full again) in batches."""
+        return await delete_in_batches(
+            db,
+            RateLimitBucket.key,
+            RateLimitBucket.updated_at < time.time() - idle_seconds,
+            batch_size=batch_size
+        )
+
+    def stats(self) -> dict:
+        return {"backend": "database"}
+
+
+class RateLimiter:
+    def __init__(self, store, enabled: bool = True):
+        self.store = store
+        self.enabled = enabled
+
+    async def check(self, limit: RateLimit, key: str) -> None:
+        """Count a hit against ``key``; raise 429 with Retry-After when over the limit."""
+        if not self.enabled:
+            return
+        retry_after = await self.store.hit(f"{limit.name}:{key}", limit)
+        if retry_after:
+            limit.rejected.inc()
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many attempts, please retry later",
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+        limit.admitted.inc()
+
+    def stats(self) -> dict:
+        return {"enabled": self.enabled, **self.store.stats()}
+
+
+login_ip_limit = RateLimit("login_ip", settings.LOGIN_IP_BURST, settings.LOGIN_IP_PER_MINUTE)
+login_email_limit = RateLimit("login_email", settings.LOGIN_EMAIL_BURST, settings.LOGIN_EMAIL_PER_MINUTE)
+
+rate_limiter = RateLimiter(
+    DatabaseBucketStore(AsyncSessionLocal)
+    if settings.LOGIN_RATE_LIMIT_BACKEND == "database"
+    else MemoryBucketStore(max_keys=settings.RATE_LIMIT_MAX_KEYS),
+    enabled=settings.LOGIN_RATE_LIMIT_ENABLED,
+)
@@ -0,0 +1,134 @@
+import asyncio
+import hashlib
+import logging
+from datetime import datetime
+from typing import Dict
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.models import BlacklistedToken
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Rows can commit slightly out of id order; re-reading a window below the
+# last seen id picks up late commits.
+SYNC_ID_OVERLAP = 1000
+
+
+def revocation_key(token: str, payload: dict) -> str:
+    """Fixed-width key identifying a token in the revocation list.
+
+    Tokens carry a random ``jti``; older tokens without one are identified
+    by the SHA-256 digest of the encoded token.
+    """
+    jti = payload.get("jti")
+    if jti:
+        return str(jti)
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class RevocationIndex:
+    """In-memory mirror of ``blacklisted_tokens`` keyed by revocation key.
+
+    Almost every token checked is not revoked, so answering from memory
+    saves a query per authenticated request. The index is an exact set
+    (no false positives), loaded at startup, updated immediately when this
+    process revokes a token, and refreshed from the table every
+    ``sync_interval_seconds`` to pick up revocations made by other workers,
+    so a token revoked on another worker can still be accepted here for up
+    to that interval. Entries are dropped once the token has expired.
+
+    The set cannot drop unexpired entries without missing revocations, so
+    when it would grow past ``max_entries`` it is cleared and disabled
+    instead, and lookups fall back to the table until the process restarts.
+    """
+
+    def __init__(self, sync_interval_seconds: float = 5, max_entries: int = 1_000_000):
+        self.sync_interval_seconds = sync_interval_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[str, datetime] = {}
+        self._last_id = 0
+        self.loaded = False
+        self.overflowed = False
+        self.lookups = 0
+        self.hits = 0
+
+    def add(self, key: str, expires_at: datetime) -> None:
+        if not self.loaded:
+            return
+        self._entries[key] = expires_at
+        self._check_size()
+
+    def _check_size(self) -> None:
+        if len(self._entries) <= self.max_entries:
+            return
+        logger.warning(
+            "Revocation index exceeded %d entries; falling back to database lookups",
+            self.max_entries,
+        )
+        self._entries.clear()
+        self.loaded = False
+        self.overflowed = True
+
+    def contains(self, key: str) -> bool:
+        self.lookups += 1
+        expires_at = self._entries.get(key)
+        if expires_at is None:
+            return False
+        if expires_at < datetime.utcnow():
+            del self._entries[key]
+            return False
+        self.hits += 1
+        return True
+
+    def evict_expired(self) -> int:
+        now = datetime.utcnow()
+        expired = [key for key, expires_at in self._entries.items() if expires_at < now]
+        for key in expired:
+            del self._entries[key]
+        return len(expired)
+
+    async def sync(self, db: AsyncSession) -> None:
+        if self.overflowed:
+            return
+        query = (
+            select(BlacklistedToken.id, BlacklistedToken.jti, BlacklistedToken.expires_at)
+            .where(
+                BlacklistedToken.id > self._last_id - SYNC_ID_OVERLAP,
+                BlacklistedToken.expires_at > datetime.utcnow()
+            )
+        )
+        result = await db.execute(query)
+        for row_id, jti, expires_at in result:
+            self._entries[jti] = expires_at
+            self._last_id = max(self._last_id, row_id)
+        self.loaded = True
+        self._check_size()
+
+    async def run_forever(self, session_factory) -> None:
+        while True:
+            await asyncio.sleep(self.sync_interval_seconds)
+            try:
+                async with session_factory() as session:
+                    await self.sync(session)
+                self.evict_expired()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Revocation index sync failed")
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.loaded,
+            "overflowed": self.overflowed,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "lookups": self.lookups,
+            "hits": self.hits,
+        }
+
+
+revocation_index = RevocationIndex(
+    sync_interval_seconds=settings.REVOCATION_SYNC_INTERVAL_SECONDS,
+    max_entries=settings.REVOCATION_INDEX_MAX_ENTRIES,
+)
@@ -0,0 +1,61 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+from utils.metrics import single_flight_calls_total
+
+
+class SingleFlight:
+    """Coalesces concurrent identical lookups into one query.
+
+    The first caller for a key (the leader) runs the lookup; callers that
+    arrive while it is in flight await the same result instead of issuing
+    their own query. Nothing is cached: once the leader finishes, the next
+    caller starts a new lookup.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+        self.leaders = 0
+        self.followers = 0
+        self._leader_counter = single_flight_calls_total.labels(name, "leader")
+        self._follower_counter = single_flight_calls_total.labels(name, "follower")
+
+    async def do(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        future = self._calls.get(key)
+        if future is not None:
+            self.followers += 1
+            self._follower_counter.inc()
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # The leader was cancelled (e.g. its client went away); fetch ourselves
+                return await fetch()
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        self.leaders += 1
+        self._leader_counter.inc()
+        try:
+            result = await fetch()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Followers re-raise it; don't warn when there are none
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._calls[key]
+
+    def stats(self) -> dict:
+        return {"in_flight": len(self._calls), "leaders": self.leaders, "queries_saved": self.followers}
+
+
+user_by_id_flight = SingleFlight("user_by_id")
+user_by_email_flight = SingleFlight("user_by_email")
@@ -0,0 +1,140 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from email.message import Message
+from typing import AsyncIterator, List
+import aiosmtplib
+from config import settings
+from utils.metrics import smtp_send_error, smtp_send_ok
+
+
+class _PooledConnection:
+    def __init__(self, smtp: aiosmtplib.SMTP):
+        self.smtp = smtp
+        self.last_used = time.monotonic()
+
+
+class SMTPConnectionPool:
+    """A small pool of warm SMTP sessions shared by the whole process.
+
+    Connections are opened lazily (connect + EHLO) and returned to the pool
+    after use. A connection that sat idle longer than ``keepalive_seconds``
+    is probed with NOOP before reuse and transparently replaced if the
+    server has dropped it.
+    """
+
+    def __init__(
+        self,
+        hostname: str,
+        port: int,
+        size: int = 2,
+        keepalive_seconds: float = 30,
+        timeout: float = 10,
+    ):
+        self.hostname = hostname
+        self.port = port
+        self.size = size
+        self.keepalive_seconds = keepalive_seconds
+        self.timeout = timeout
+        self._idle: List[_PooledConnection] = []
+        self._slots = asyncio.Semaphore(size)
+
+    async def _connect(self) -> _PooledConnection:
+        smtp = aiosmtplib.SMTP(
+            hostname=self.hostname,
+            port=self.port,
+            timeout=self.timeout,
+            start_tls=False,
+        )
+        await smtp.connect()
+        await smtp.ehlo()
+        return _PooledConnection(smtp)
+
+    async def _discard(self, conn: _PooledConnection) -> None:
+        try:
+            await conn.smtp.quit()
+        except Exception:
+            conn.smtp.close()
+
+    async def _checkout(self) -> _PooledConnection:
+        while self._idle:
+            conn = self._idle.pop()
+            if not conn.smtp.is_connected:
+                continue
+            if time.monotonic() - conn.last_used < self.keepalive_seconds:
+                return conn
+            try:
+                await conn.smtp.noop()
+                return conn
+            except aiosmtplib.SMTPException:
+                conn.smtp.close()
+        return await self._connect()
+
+    def _checkin(self, conn: _PooledConnection) -> None:
+        conn.last_used = time.monotonic()
+        self._idle.append(conn)
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[_PooledConnection]:
+        async with self._slots:
+            conn = await self._checkout()
+            try:
+                yield conn
+            except BaseException:
+                await self._discard(conn)
+                raise
+            if conn.smtp.is_connected:
+                self._checkin(conn)
+
+    async def send(self, message: Message) -> None:
+        error = (await self.send_many([message]))[0]
+        if error is not None:
+            raise error
+
+    async def send_many(self, messages: List[Message]) -> List[Exception | None]:
+        """Send several messages over one session.
+
+        Returns one entry per message: ``None`` when it was accepted, or the
+        exception that made it fail. A dropped connection is reopened once
+        per message before giving up on it.
+        """
+        results: List[Exception | None] = []
+        try:
+            async with self.connection() as conn:
+                for message in messages:
+                    started = time.perf_counter()
+                    try:
+                        await self._send_with_reconnect(conn, message)
+                        results.append(None)
+                        smtp_send_ok.observe(time.perf_counter() - started)
+                    except Exception as e:
+                        # Also covers messages the client rejects outright
+                        results.append(e)
+                        smtp_send_error.observe(time.perf_counter() - started)
+        except (aiosmtplib.SMTPException, OSError) as e:
+            # Could not open a session at all
+            return [e] * len(messages)
+        return results
+
+    async def _send_with_reconnect(self, conn: _PooledConnection, message: Message) -> None:
+        try:
+            await conn.smtp.send_message(message)
+        except (aiosmtplib.SMTPServerDisconnected, ConnectionError):
+            conn.smtp.close()
+            fresh = await self._connect()
+            conn.smtp = fresh.smtp
+            await conn.smtp.send_message(message)
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, []
+        for conn in idle:
+            await self._discard(conn)
+
+
+smtp_pool = SMTPConnectionPool(
+    hostname=settings.SMTP_HOST,
+    port=settings.SMTP_PORT,
+    size=settings.SMTP_POOL_SIZE,
+    keepalive_seconds=settings.SMTP_KEEPALIVE_SECONDS,
+    timeout=settings.SMTP_TIMEOUT,
+)
@@ -3,8 +3,10 @@ from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from db.models import BlacklistedToken
+from db.batching import delete_in_batches
 from jose import jwt
 from config import settings
+from services.revocation_index import revocation_index, revocation_key
 
 class TokenBlacklistService:
     def __init__(self, db: AsyncSession):
@@ -14,32 +16,39 @@ class TokenBlacklistService:
         try:
             # Decode token to get expiry
             payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-            expires_at = datetime.fromtimestamp(payload['exp'])
-            
+            expires_at = datetime.utcfromtimestamp(payload['exp'])
+            key = revocation_key(token, payload)
+
             # Add token to blacklist
             db_token = BlacklistedToken(
-                token=token,
+                jti=key,
                 expires_at=expires_at
             )
             self.db.add(db_token)
             await self.db.commit()
+            revocation_index.add(key, expires_at)
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid token"
             )
 
-    async def is_token_blacklisted(self, token: str) -> bool:
-        query = select(BlacklistedToken).where(BlacklistedToken.token == token)
+    async def is_token_blacklisted(self, token: str, payload: dict) -> bool:
+        key = revocation_key(token, payload)
+        if revocation_index.loaded:
+            return revocation_index.contains(key)
+        query = select(BlacklistedToken.id).where(BlacklistedToken.jti == key)
         result = await self.db.execute(query)
         return result.scalar_one_or_none() is not None
 
-    async def cleanup_expired_tokens(self) -> None:
-        """Remove expired tokens from blacklist"""
-        now = datetime.utcnow()
-        await self.db.execute(
-            BlacklistedToken.__table__.delete().where(
-                BlacklistedToken.expires_at < now
-            )
+    async def cleanup_expired_tokens(self, batch_size: int = 1000) -> int:
+        """Remove expired tokens from blacklist in small batches.
+
+        Returns the number of rows removed.
+        """
+        return await delete_in_batches(
+            self.db,
+            BlacklistedToken.id,
+            BlacklistedToken.expires_at < datetime.utcnow(),
+            batch_size=batch_size
         )
-        await self.db.commit() 
\ No newline at end of file
@@ -1,21 +1,36 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete, update
+from sqlalchemy import select, insert, delete, update, bindparam, any_, Row, Integer, String
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from asyncpg.exceptions import UniqueViolationError
+from typing import AsyncIterator, Sequence
 from models.user import UserCreate, User, UserInDB
 from db.models import UserDB
-from utils.security import get_password_hash
+from utils.security import password_hasher
 from datetime import datetime
 from models.user import UserUpdate
-from services.mail_service import MailService
-import os
-from string import Template
+from services.email_outbox import EmailOutboxService
+from services.email_templates import email_templates
+from services.principal_cache import principal_cache, token_versions
+from services.single_flight import user_by_id_flight, user_by_email_flight
+from db.instrumentation import session_has_writes
+from db.routing import session_dialect
 from config import settings
 from db.models import UserRole
 from fastapi import HTTPException
 
+# Changing any of these invalidates previously issued access tokens
+TOKEN_VERSION_FIELDS = {"hashed_password", "role", "is_active"}
+
+# Columns of the public User model, returned by INSERT/UPDATE ... RETURNING
+# and selected for listings
+USER_COLUMNS = (UserDB.id, UserDB.email, UserDB.full_name, UserDB.is_active, UserDB.role, UserDB.updated_at)
+
 class UserService:
     def __init__(self, db: AsyncSession):
         self.db = db
-        self.mail_service = MailService()
+        self.email_outbox = EmailOutboxService(db)
 
     def _map_to_user_in_db(self, db_user: UserDB) -> UserInDB:
         return UserInDB(
@@ -24,9 +39,9 @@ class UserService:
             full_name=db_user.full_name,
             is_active=db_user.is_active,
             hashed_password=db_user.hashed_password,
-            reset_token=db_user.reset_token,
-            reset_token_expires=db_user.reset_token_expires,
-            role=db_user.role
+            role=db_user.role,
+            token_version=db_user.token_version,
+            updated_at=db_user.updated_at
         )
 
     def _map_to_user(self, db_user: UserDB) -> User:
@@ -35,55 +50,163 @@ class UserService:
             email=db_user.email,
             full_name=db_user.full_name,
             is_active=db_user.is_active,
-            role=db_user.role
+            role=db_user.role,
+            updated_at=db_user.updated_at
         )
 
-    async def _send_welcome_email(self, user: User) -> None:
-        # Read the email template
-        template_path = os.path.join('email-templates', 'auth', 'new_account.html')
-        with open(template_path, 'r') as file:
-            template = Template(file.read())
-
-        # Format the template with user data
-        html_content = template.safe_substitute(
-            app_name=settings.APP_NAME,
-            full_name=user.full_name,
-            email=user.email,
-            login_url=f"{settings.DOMAIN_NAME}/login"
+    def _welcome_email(self, email: str, full_name: str) -> dict:
+        # Render the preloaded template with user data
+        content = email_templates.render(
+            "auth/new_account",
+            full_name=full_name,
+            email=email
         )
+        return {
+            "to_email": email,
+            "subject": f"Welcome to {settings.APP_NAME}!",
+            "html_content": content.html,
+            "text_content": content.text,
+        }
 
-        # Send the welcome email
-        await self.mail_service.send_email(
-            to_email=user.email,
-            subject=f"Welcome to {settings.APP_NAME}!",
-            html_content=html_content
-        )
+    def _queue_welcome_email(self, email: str, full_name: str) -> None:
+        # Queue the welcome email; it is committed with the new user
+        self.email_outbox.enqueue(**self._welcome_email(email, full_name))
 
     async def create_user(self, user: UserCreate) -> User:
         # check if role is admin (remove this check when admin creation is implemented)
         if user.role == UserRole.ADMIN:
             raise HTTPException(status_code=400, detail="Admin role is not allowed to be created by this endpoint")
         # Create user in database
-        hashed_password = get_password_hash(user.password)
-        db_user = UserDB(
-            email=user.email,
-            full_name=user.full_name,
-            hashed_password=hashed_password,
-            role=user.role
+        hashed_password = await password_hasher.hash(user.password)
+        query = (
+            insert(UserDB)
+            .values(
+                email=user.email,
+                full_name=user.full_name,
+                hashed_password=hashed_password,
+                role=user.role
+            )
+            .returning(*USER_COLUMNS)
+        )
+        try:
+            # The unique index on email is the duplicate check
+            result = await self.db.execute(query)
+            row = result.one()
+            self._queue_welcome_email(email=user.email, full_name=user.full_name)
+            await self.db.commit()
+        except IntegrityError:
+            await self.db.rollback()
+            raise HTTPException(status_code=400, detail="Email already registered")
+
+        return self._map_to_user(row)
+
+    def _dialect_name(self) -> str:
+        return session_dialect(self.db).name
+
+    def _column_in(self, column, values: list, item_type):
+        """``column = ANY(:values)`` on PostgreSQL (one bind parameter, so one
+        cached statement whatever the list size), ``IN (...)`` elsewhere."""
+        if self._dialect_name() == "postgresql":
+            return column == any_(bindparam(None, values, type_=ARRAY(item_type)))
+        return column.in_(values)
+
+    async def bulk_create_users(self, users: list[UserCreate]) -> dict[str, int]:
+        """Create many users at once and queue their welcome emails.
+
+        Emails that already exist are skipped (checked with one set-based
+        query, and again by the unique constraint on insert). Returns a map
+        of email to new user id for the rows that were created.
+        """
+        if not users:
+            return {}
+        emails = [user.email for user in users]
+        result = await self.db.execute(
+            select(UserDB.email).where(self._column_in(UserDB.email, emails, String))
         )
-        self.db.add(db_user)
+        existing = set(result.scalars())
+        # End the read transaction: hashing a large file takes minutes, and
+        # the connection must not sit idle in transaction meanwhile
+        await self.db.rollback()
+        new_users = [user for user in users if user.email not in existing]
+        if not new_users:
+            return {}
+
+        hashed_passwords = await password_hasher.hash_many([user.password for user in new_users])
+        # Set explicitly: COPY bypasses the column default
+        now = datetime.utcnow()
+        records = [
+            {
+                "email": user.email,
+                "full_name": user.full_name,
+                "hashed_password": hashed_password,
+                "is_active": True,
+                "role": user.role,
+                "token_version": 0,
+                "updated_at": now,
+            }
+            for user, hashed_password in zip(new_users, hashed_passwords)
+        ]
+
+        created = await self._insert_users(records)
+        await self.email_outbox.enqueue_many([
+            self._welcome_email(email=user.email, full_name=user.full_name)
+            for user in new_users
+            if user.email in created
+        ])
         await self.db.commit()
-        await self.db.refresh(db_user)
-        
-        # Convert to Pydantic model
-        created_user = self._map_to_user(db_user)
-        
-        # Send welcome email
-        await self._send_welcome_email(created_user)
-        
-        return created_user
+        return created
+
+    async def _insert_users(self, records: list[dict]) -> dict[str, int]:
+        if session_dialect(self.db).driver == "asyncpg":
+            try:
+                async with self.db.begin_nested():
+                    return await self._copy_users(records)
+            except UniqueViolationError:
+                # A concurrent signup took one of the emails; fall back to
+                # an insert that skips conflicting rows
+                pass
+
+        dialect_insert = pg_insert if self._dialect_name() == "postgresql" else sqlite_insert
+        query = (
+            dialect_insert(UserDB)
+            .on_conflict_do_nothing(index_elements=[UserDB.email])
+            .returning(UserDB.email, UserDB.id)
+        )
+        # executemany: SQLAlchemy batches the rows into multi-row INSERTs
+        result = await self.db.execute(query, records)
+        return {email: user_id for email, user_id in result}
+
+    async def _copy_users(self, records: list[dict]) -> dict[str, int]:
+        """Load rows with PostgreSQL COPY through the raw asyncpg connection."""
+        columns = list(records[0].keys())
+        connection = await self.db.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            UserDB.__tablename__,
+            records=[
+                tuple(
+                    value.value if isinstance(value, UserRole) else value
+                    for value in record.values()
+                )
+                for record in records
+            ],
+            columns=columns,
+        )
+        emails = [record["email"] for record in records]
+        result = await self.db.execute(
+            select(UserDB.email, UserDB.id).where(self._column_in(UserDB.email, emails, String))
+        )
+        return {email: user_id for email, user_id in result}
 
     async def get_user(self, user_id: int) -> User | None:
+        # Concurrent lookups of the same user share one query, unless this
+        # session has written and must read its own changes
+        if session_has_writes(self.db):
+            return await self._fetch_user(user_id)
+        key = (self.db.sync_session_class, user_id)
+        return await user_by_id_flight.do(key, lambda: self._fetch_user(user_id))
+
+    async def _fetch_user(self, user_id: int) -> User | None:
         query = select(UserDB).where(UserDB.id == user_id)
         result = await self.db.execute(query)
         db_user = result.scalar_one_or_none()
@@ -93,7 +216,22 @@ class UserService:
             
         return self._map_to_user(db_user)
 
+    async def get_user_in_db(self, user_id: int) -> UserInDB | None:
+        """The full user row, including ``token_version``."""
+        query = select(UserDB).where(UserDB.id == user_id)
+        result = await self.db.execute(query)
+        db_user = result.scalar_one_or_none()
+        if db_user is None:
+            return None
+        return self._map_to_user_in_db(db_user)
+
     async def get_user_by_email(self, email: str) -> UserInDB | None:
+        if session_has_writes(self.db):
+            return await self._fetch_user_by_email(email)
+        key = (self.db.sync_session_class, email)
+        return await user_by_email_flight.do(key, lambda: self._fetch_user_by_email(email))
+
+    async def _fetch_user_by_email(self, email: str) -> UserInDB | None:
         query = select(UserDB).where(UserDB.email == email)
         result = await self.db.execute(query)
         db_user = result.scalar_one_or_none()
@@ -103,52 +241,105 @@ class UserService:
             
         return self._map_to_user_in_db(db_user)
 
+    async def get_user_rows_by_ids(self, ids: list[int]) -> tuple[list[Row], list[int]]:
+        """Return the users with ``ids`` in the order given, as plain
+        ``USER_COLUMNS`` rows, and the ids not found.
+
+        Duplicate ids are returned once, at their first position.
+        """
+        ids = list(dict.fromkeys(ids))
+        if not ids:
+            return [], []
+        query = select(*USER_COLUMNS).where(self._column_in(UserDB.id, ids, Integer))
+        result = await self.db.execute(query)
+        found = {row.id: row for row in result}
+        rows = [found[user_id] for user_id in ids if user_id in found]
+        missing = [user_id for user_id in ids if user_id not in found]
+        return rows, missing
+
     async def delete_user(self, user_id: int) -> None:
         # check if user is admin
         query = delete(UserDB).where(UserDB.id == user_id)
         await self.db.execute(query)
         await self.db.commit()
+        principal_cache.invalidate(user_id)
+        token_versions.invalidate(user_id)
 
-    async def update_user_reset_token(self, email: str, reset_token: str, expires: datetime) -> None:
-        query = (
-            update(UserDB)
-            .where(UserDB.email == email)
-            .values(reset_token=reset_token, reset_token_expires=expires)
-        )
-        await self.db.execute(query)
-        await self.db.commit()
-
-    async def get_user_by_reset_token(self, reset_token: str) -> UserInDB | None:
-        query = select(UserDB).where(UserDB.reset_token == reset_token)
+    async def get_token_version(self, user_id: int) -> int | None:
+        query = select(UserDB.token_version).where(UserDB.id == user_id)
         result = await self.db.execute(query)
-        db_user = result.scalar_one_or_none()
-        
-        if db_user is None:
-            return None
-            
-        return self._map_to_user_in_db(db_user)
-    
+        return result.scalar_one_or_none()
+
     async def update_user(self, user_id: int, user_data: UserUpdate) -> User:
+        values = user_data.model_dump(exclude_none=True)
+        if not values:
+            updated_user = await self.get_user(user_id)
+            if not updated_user:
+                raise HTTPException(status_code=404, detail="User not found")
+            return updated_user
+        if TOKEN_VERSION_FIELDS & values.keys():
+            values["token_version"] = UserDB.token_version + 1
         query = (
             update(UserDB)
             .where(UserDB.id == user_id)
-            .values(**user_data.model_dump(exclude_none=True))
+            .values(**values)
+            .returning(*USER_COLUMNS)
         )
-        await self.db.execute(query)
-        await self.db.commit()
-        
-        # Fetch the updated user
-        updated_user = await self.get_user(user_id)
-        if not updated_user:
+        try:
+            result = await self.db.execute(query)
+            row = result.one_or_none()
+            await self.db.commit()
+        except IntegrityError:
+            await self.db.rollback()
+            raise HTTPException(status_code=400, detail="Email already registered")
+        if row is None:
             raise HTTPException(status_code=404, detail="User not found")
-        return updated_user
+        principal_cache.invalidate(user_id)
+        token_versions.invalidate(user_id)
+        return self._map_to_user(row)
+
+    async def iter_user_rows(self, chunk_size: int = 1000) -> AsyncIterator[Sequence[Row]]:
+        """Stream all users as plain rows, ``chunk_size`` rows at a time.
 
-    async def get_latest_users(self, limit: int = 100) -> list[User]:
+        Uses a server-side cursor, so memory stays flat regardless of table
+        size; rows are not turned into ORM or Pydantic objects.
+        """
         query = (
-            select(UserDB)
-            .order_by(UserDB.id.desc())
-            .limit(limit)
+            select(UserDB.id, UserDB.email, UserDB.full_name, UserDB.is_active, UserDB.role)
+            .order_by(UserDB.id)
+            .execution_options(yield_per=chunk_size)
         )
+        result = await self.db.stream(query)
+        async for rows in result.partitions(chunk_size):
+            yield rows
+
+    async def list_user_rows(
+        self,
+        limit: int = 100,
+        before_id: int | None = None,
+        role: UserRole | None = None,
+        is_active: bool | None = None,
+        email_prefix: str | None = None
+    ) -> tuple[Sequence[Row], int | None]:
+        """Return one page of users, newest first, as plain ``USER_COLUMNS`` rows.
+
+        Keyset pagination: ``before_id`` is the id of the last user of the
+        previous page; the second value returned is the ``before_id`` for
+        the next page, or ``None`` when this is the last one.
+        """
+        query = select(*USER_COLUMNS)
+        if before_id is not None:
+            query = query.where(UserDB.id < before_id)
+        if role is not None:
+            query = query.where(UserDB.role == role)
+        if is_active is not None:
+            query = query.where(UserDB.is_active == is_active)
+        if email_prefix:
+            query = query.where(UserDB.email.startswith(email_prefix, autoescape=True))
+        # Fetch one extra row to know whether another page exists
+        query = query.order_by(UserDB.id.desc()).limit(limit + 1)
+
         result = await self.db.execute(query)
-        users = result.scalars().all()
-        return [self._map_to_user(user) for user in users]
\ No newline at end of file
+        rows = result.all()
+        next_before_id = rows[limit - 1].id if len(rows) > limit else None
+        return rows[:limit], next_before_id
@@ -0,0 +1,87 @@
+"""Tests drive the app in-process against a throwaway SQLite database.
+
+Settings are read when the app is imported, so the environment is set up
+here first. Background loops are switched off to keep statement counts
+deterministic.
+"""
+import os
+import tempfile
+
+DB_PATH = os.path.join(tempfile.mkdtemp(prefix="api-tests-"), "app.db")
+
+os.environ.update({
+    "DATABASE_URL": f"sqlite+aiosqlite:///{DB_PATH}",
+    "ENVIRONMENT": "test",
+    "DEBUG": "false",
+    "SECRET_KEY": "test-secret-key",
+    "POSTGRES_USER": "test",
+    "POSTGRES_PASSWORD": "test",
+    "POSTGRES_DB": "test",
+    "POSTGRES_HOST": "localhost",
+    "POSTGRES_PORT": "5432",
+    "EMAIL_DISPATCHER_ENABLED": "false",
+    "REVOCATION_INDEX_ENABLED": "false",
+    "PURGE_ENABLED": "false",
+    "PROFILING_ENABLED": "false",
+    "LOGIN_RATE_LIMIT_ENABLED": "false",
+})
+
+import httpx
+import pytest
+from sqlalchemy import update
+from main import app
+from db.database import AsyncSessionLocal
+from db.models import UserDB, UserRole
+from services.principal_cache import principal_cache, token_versions
+
+PASSWORD = "test-password"
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def client():
+    if os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+    principal_cache.clear()
+    token_versions.clear()
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            yield client
+
+
+@pytest.fixture
+def signup(client):
+    async def signup(email: str, full_name: str = "Test User") -> dict:
+        response = await client.post("/api/v1/users", json={
+            "email": email,
+            "full_name": full_name,
+            "password": PASSWORD,
+            "role": "CLIENT",
+        })
+        assert response.status_code == 200, response.text
+        return response.json()
+    return signup
+
+
+@pytest.fixture
+def login(client):
+    async def login(email: str) -> dict:
+        response = await client.post("/api/v1/auth/login", json={"email": email, "password": PASSWORD})
+        assert response.status_code == 200, response.text
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+    return login
+
+
+@pytest.fixture
+async def admin_headers(signup, login):
+    admin = await signup("admin@example.com", full_name="Admin")
+    async with AsyncSessionLocal() as session:
+        await session.execute(update(UserDB).where(UserDB.id == admin["id"]).values(role=UserRole.ADMIN))
+        await session.commit()
+    principal_cache.clear()
+    return await login("admin@example.com")
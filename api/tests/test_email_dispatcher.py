@@ -0,0 +1,101 @@
+from datetime import datetime
+import pytest
+from sqlalchemy import select
+from db.database import AsyncSessionLocal
+from db.models import EmailOutbox, EmailStatus
+from services.email_dispatcher import EmailDispatcher
+from services.email_outbox import EmailOutboxService
+
+pytestmark = pytest.mark.anyio
+
+
+class FakeMailService:
+    """Records sends; ``fail`` maps recipients to the error their send returns."""
+
+    def __init__(self, fail: dict | None = None, during_send=None):
+        self.fail = fail or {}
+        self.during_send = during_send
+        self.sent = []
+
+    def build_message(self, to_email, subject, html_content, text_content=None):
+        if to_email == "unbuildable":
+            raise ValueError("bad address")
+        return to_email
+
+    async def send_messages(self, messages):
+        if self.during_send is not None:
+            await self.during_send()
+        self.sent.extend(messages)
+        return [self.fail.get(message) for message in messages]
+
+
+def _dispatcher(mail_service: FakeMailService, **kwargs) -> EmailDispatcher:
+    dispatcher = EmailDispatcher(session_factory=AsyncSessionLocal, **kwargs)
+    dispatcher.mail_service = mail_service
+    return dispatcher
+
+
+async def _enqueue(*recipients: str) -> None:
+    async with AsyncSessionLocal() as session:
+        for to_email in recipients:
+            EmailOutboxService(session).enqueue(to_email=to_email, subject="Hi", html_content="<p>Hi</p>")
+        await session.commit()
+
+
+async def _rows() -> dict:
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(select(EmailOutbox))
+        return {email.to_email: email for email in result.scalars()}
+
+
+async def test_results_are_recorded_per_row(client):
+    await _enqueue("ok@example.com", "down@example.com", "unbuildable")
+    mail = FakeMailService(fail={"down@example.com": OSError("refused")})
+
+    assert await _dispatcher(mail).dispatch_batch() == 3
+
+    rows = await _rows()
+    assert mail.sent == ["ok@example.com", "down@example.com"]
+    assert rows["ok@example.com"].status == EmailStatus.SENT
+    for to_email, error in [("down@example.com", "refused"), ("unbuildable", "bad address")]:
+        assert rows[to_email].status == EmailStatus.PENDING
+        assert rows[to_email].attempts == 1
+        assert rows[to_email].last_error == error
+        assert rows[to_email].next_attempt_at > datetime.utcnow()
+
+
+async def test_rows_are_leased_and_committed_before_sending(client):
+    await _enqueue("ok@example.com")
+    seen = {}
+
+    async def during_send():
+        # Another dispatcher finds nothing to claim, and the lease is visible
+        # to other connections, so no transaction is open during the send
+        seen["claimed"] = await _dispatcher(FakeMailService()).dispatch_batch()
+        seen["row"] = (await _rows())["ok@example.com"]
+
+    assert await _dispatcher(FakeMailService(during_send=during_send)).dispatch_batch() == 1
+
+    assert seen["claimed"] == 0
+    assert seen["row"].attempts == 1
+    assert seen["row"].next_attempt_at > datetime.utcnow()
+    assert (await _rows())["ok@example.com"].status == EmailStatus.SENT
+
+
+async def test_expired_lease_is_retried_then_dead_lettered(client):
+    await _enqueue("lost@example.com")
+    # A dispatcher that dies mid-send leaves the row leased with no result
+    crashed = _dispatcher(FakeMailService(), lease_seconds=-1, max_attempts=2)
+
+    async def crash():
+        raise SystemExit
+
+    crashed.mail_service.during_send = crash
+    for _ in range(2):
+        with pytest.raises(SystemExit):
+            await crashed.dispatch_batch()
+
+    assert await _dispatcher(FakeMailService(), max_attempts=2).dispatch_batch() == 1
+    row = (await _rows())["lost@example.com"]
+    assert row.status == EmailStatus.DEAD
+    assert row.attempts == 2
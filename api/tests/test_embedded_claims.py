@@ -0,0 +1,84 @@
+import pytest
+from sqlalchemy import update
+from config import settings
+from db.database import AsyncSessionLocal
+from db.models import UserDB, UserRole
+from db.instrumentation import track_queries
+from services.password_reset import PasswordResetService
+from services.principal_cache import principal_cache, token_versions
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture(autouse=True)
+def embed_claims(monkeypatch):
+    monkeypatch.setattr(settings, "JWT_EMBED_CLAIMS", True)
+
+
+def _user_queries(stats) -> list:
+    return [s for s in stats.statements if "FROM users" in s or "UPDATE users" in s]
+
+
+async def test_password_change_invalidates_tokens(client, signup, login):
+    user = await signup("alice@example.com")
+    headers = await login("alice@example.com")
+    assert (await client.get("/api/v1/users/me", headers=headers)).status_code == 200
+
+    async with AsyncSessionLocal() as session:
+        reset_token = await PasswordResetService(session).create_token(user["id"])
+        await session.commit()
+    response = await client.post("/api/v1/auth/password-reset/confirm", json={
+        "token": reset_token,
+        "new_password": "another-password",
+    })
+    assert response.status_code == 200, response.text
+
+    response = await client.get("/api/v1/users/me", headers=headers)
+    assert response.status_code == 401
+    assert response.json()["detail"] == "Token is no longer valid"
+
+
+async def test_role_change_invalidates_tokens(client, signup, login):
+    user = await signup("alice@example.com")
+    headers = await login("alice@example.com")
+    assert (await client.get("/api/v1/users/me", headers=headers)).status_code == 200
+
+    # Roles are not editable through the API; an admin tool bumps the
+    # version alongside the role, as UserService.update_user does.
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            update(UserDB)
+            .where(UserDB.id == user["id"])
+            .values(role=UserRole.ADMIN, token_version=UserDB.token_version + 1)
+        )
+        await session.commit()
+    principal_cache.invalidate(user["id"])
+    token_versions.invalidate(user["id"])
+
+    response = await client.get("/api/v1/users/me", headers=headers)
+    assert response.status_code == 401
+    assert response.json()["detail"] == "Token is no longer valid"
+
+    headers = await login("alice@example.com")
+    response = await client.get("/api/v1/users/me", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["role"] == "ADMIN"
+
+
+async def test_cold_caches_are_filled_from_one_row(client, signup, login):
+    user = await signup("alice@example.com")
+    headers = await login("alice@example.com")
+    principal_cache.clear()
+    token_versions.clear()
+
+    with track_queries(keep_statements=True) as stats:
+        response = await client.get("/api/v1/users/me", headers=headers)
+    assert response.status_code == 200
+    assert len(_user_queries(stats)) == 1
+    assert token_versions.get(user["id"]) == 0
+    assert principal_cache.get_by_id(user["id"]) is not None
+
+    with track_queries(keep_statements=True) as stats:
+        response = await client.get("/api/v1/users/me", headers=headers)
+    assert response.status_code == 200
+    assert _user_queries(stats) == []
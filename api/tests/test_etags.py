@@ -0,0 +1,85 @@
+import pytest
+from db.database import AsyncSessionLocal
+from services.password_reset import PasswordResetService
+from utils.http_cache import etag_matches
+
+pytestmark = pytest.mark.anyio
+
+
+def test_if_none_match_uses_weak_comparison():
+    etag = 'W/"1-20260101120000000000"'
+    assert etag_matches(etag, etag)
+    assert etag_matches('"1-20260101120000000000"', etag)
+    assert etag_matches('W/"other", W/"1-20260101120000000000"', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('W/"1-20260101120000000001"', etag)
+    assert not etag_matches(None, etag)
+
+
+async def test_user_is_revalidated_until_it_changes(client, signup, login):
+    user = await signup("cached@example.com")
+    headers = await login("cached@example.com")
+
+    response = await client.get(f"/api/v1/users/{user['id']}")
+    etag = response.headers["etag"]
+    assert etag.startswith(f'W/"{user["id"]}-')
+    assert response.headers["cache-control"] == "private, no-cache"
+
+    response = await client.get(f"/api/v1/users/{user['id']}", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+    await client.put(f"/api/v1/users/{user['id']}", json={"full_name": "Changed"}, headers=headers)
+    response = await client.get(f"/api/v1/users/{user['id']}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["full_name"] == "Changed"
+    assert response.headers["etag"] != etag
+
+
+async def test_me_honours_if_none_match(client, signup, login):
+    await signup("me@example.com")
+    headers = await login("me@example.com")
+    response = await client.get("/api/v1/users/me", headers=headers)
+    response = await client.get("/api/v1/users/me", headers={**headers, "If-None-Match": response.headers["etag"]})
+    assert response.status_code == 304
+
+
+async def test_password_reset_changes_the_etag(client, signup):
+    user = await signup("reset@example.com")
+    response = await client.get(f"/api/v1/users/{user['id']}")
+    etag = response.headers["etag"]
+
+    async with AsyncSessionLocal() as session:
+        token = await PasswordResetService(session).create_token(user["id"])
+        await session.commit()
+    await client.post("/api/v1/auth/password-reset/confirm", json={"token": token, "new_password": "new-password"})
+
+    response = await client.get(f"/api/v1/users/{user['id']}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+
+
+async def test_list_has_a_collection_etag(client, signup, admin_headers):
+    user = await signup("listed@example.com")
+    response = await client.get("/api/v1/users/list", headers=admin_headers)
+    etag = response.headers["etag"]
+
+    response = await client.get("/api/v1/users/list", headers={**admin_headers, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
+    await client.put(f"/api/v1/users/{user['id']}", json={"full_name": "Changed"}, headers=admin_headers)
+    response = await client.get("/api/v1/users/list", headers={**admin_headers, "If-None-Match": etag})
+    assert response.status_code == 200
+
+
+async def test_bulk_import_sets_updated_at(client, admin_headers):
+    body = "email,full_name,password,role\nbulk@example.com,Bulk,test-password,CLIENT\n"
+    response = await client.post(
+        "/api/v1/users/bulk",
+        content=body,
+        headers={**admin_headers, "content-type": "text/csv"}
+    )
+    user_id = response.json()["results"][0]["id"]
+    response = await client.get(f"/api/v1/users/{user_id}")
+    assert response.json()["updated_at"] is not None
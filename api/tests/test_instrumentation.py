@@ -0,0 +1,53 @@
+import logging
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from db.database import engine
+from db.instrumentation import assert_query_budget, instrument_engine, track_queries
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_query_budget_lists_statements_when_exceeded(client):
+    with pytest.raises(AssertionError) as excinfo:
+        with assert_query_budget(1):
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+                await conn.execute(text("SELECT 2"))
+    assert "Expected at most 1 queries, 2 were executed" in str(excinfo.value)
+    assert "SELECT 2" in str(excinfo.value)
+
+
+async def test_nested_scopes_and_failed_statements_count(client):
+    with track_queries() as outer:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            with track_queries() as inner:
+                with pytest.raises(Exception):
+                    await conn.execute(text("SELECT * FROM no_such_table"))
+            assert conn.sync_connection.info["query_started"] == []
+    assert inner.count == 1
+    assert outer.count == 2
+
+
+async def test_server_timing_reports_query_count(client, signup, login):
+    await signup("timing@example.com")
+    headers = await login("timing@example.com")
+    await client.get("/api/v1/users/me", headers=headers)
+
+    response = await client.get("/api/v1/users/me", headers=headers)
+    # Warm principal cache: only the revocation check runs
+    assert 'desc="1 queries"' in response.headers["server-timing"]
+    assert "total;dur=" in response.headers["server-timing"]
+
+
+async def test_slow_queries_are_logged_without_parameter_values(caplog):
+    slow_engine = create_async_engine("sqlite+aiosqlite://")
+    instrument_engine(slow_engine, slow_query_seconds=1e-9)
+    with caplog.at_level(logging.WARNING, logger="db.instrumentation"):
+        async with slow_engine.connect() as conn:
+            await conn.execute(text("SELECT :secret"), {"secret": "hunter2"})
+    await slow_engine.dispose()
+    assert "Slow query" in caplog.text
+    assert "parameters=['str']" in caplog.text
+    assert "hunter2" not in caplog.text
@@ -0,0 +1,83 @@
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import func, select
+from db.database import AsyncSessionLocal
+from db.models import BlacklistedToken, PasswordResetToken
+from services.password_reset import PasswordResetService
+from services.token_blacklist import TokenBlacklistService
+
+pytestmark = pytest.mark.anyio
+
+
+async def _create_token(user_id: int, lifetime: timedelta = timedelta(hours=24)) -> str:
+    async with AsyncSessionLocal() as session:
+        token = await PasswordResetService(session).create_token(user_id, lifetime=lifetime)
+        await session.commit()
+    return token
+
+
+async def _confirm(client, token: str, new_password: str = "another-password"):
+    return await client.post("/api/v1/auth/password-reset/confirm", json={
+        "token": token,
+        "new_password": new_password,
+    })
+
+
+async def _count(model) -> int:
+    async with AsyncSessionLocal() as session:
+        return (await session.execute(select(func.count()).select_from(model))).scalar_one()
+
+
+async def test_token_can_only_be_used_once(client, signup):
+    user = await signup("alice@example.com")
+    token = await _create_token(user["id"])
+
+    assert (await _confirm(client, token)).status_code == 200
+    response = await _confirm(client, token, new_password="third-password")
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid or expired password reset token"
+
+    response = await client.post("/api/v1/auth/login", json={
+        "email": "alice@example.com",
+        "password": "another-password",
+    })
+    assert response.status_code == 200
+
+
+async def test_expired_token_is_rejected(client, signup):
+    user = await signup("alice@example.com")
+    token = await _create_token(user["id"], lifetime=timedelta(seconds=-1))
+
+    response = await _confirm(client, token)
+    assert response.status_code == 400
+    assert await _count(PasswordResetToken) == 1
+
+
+async def test_new_token_replaces_the_previous_one(client, signup):
+    user = await signup("alice@example.com")
+    first = await _create_token(user["id"])
+    second = await _create_token(user["id"])
+
+    assert await _count(PasswordResetToken) == 1
+    assert (await _confirm(client, first)).status_code == 400
+    assert (await _confirm(client, second)).status_code == 200
+
+
+async def test_cleanup_removes_only_expired_rows_in_batches(client, signup):
+    users = [await signup(f"user{i}@example.com") for i in range(5)]
+    for user in users[:3]:
+        await _create_token(user["id"], lifetime=timedelta(seconds=-1))
+    for user in users[3:]:
+        await _create_token(user["id"])
+    async with AsyncSessionLocal() as session:
+        session.add_all(
+            BlacklistedToken(jti=f"jti-{i}", expires_at=datetime.utcnow() + timedelta(hours=i - 2, minutes=30))
+            for i in range(5)
+        )
+        await session.commit()
+
+    async with AsyncSessionLocal() as session:
+        assert await PasswordResetService(session).cleanup_expired_tokens(batch_size=2) == 3
+        assert await TokenBlacklistService(session).cleanup_expired_tokens(batch_size=2) == 2
+    assert await _count(PasswordResetToken) == 2
+    assert await _count(BlacklistedToken) == 3
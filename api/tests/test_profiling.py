@@ -0,0 +1,45 @@
+import httpx
+import pytest
+from config import Settings
+from main import app
+from middleware.profiling import ProfilingMiddleware
+from services.auth_service import AuthService
+from services.profile_store import ProfileStore
+
+pytestmark = pytest.mark.anyio
+
+
+def _profiled_client(store: ProfileStore) -> httpx.AsyncClient:
+    transport = httpx.ASGITransport(app=ProfilingMiddleware(app, store=store))
+    return httpx.AsyncClient(transport=transport, base_url="http://test")
+
+
+async def test_admin_requests_are_profiled(client, admin_headers):
+    store = ProfileStore()
+    async with _profiled_client(store) as profiled:
+        response = await profiled.get("/api/v1/users/me", headers={**admin_headers, "X-Profile": "1"})
+    assert response.status_code == 200
+    assert [profile.trigger for profile in store.list()] == ["header"]
+
+
+async def test_failed_admin_check_serves_the_request_unprofiled(client, admin_headers, monkeypatch, caplog):
+    async def broken(self, token):
+        raise RuntimeError("database is down")
+
+    store = ProfileStore()
+    async with _profiled_client(store) as profiled:
+        monkeypatch.setattr(AuthService, "get_current_user", broken)
+        response = await profiled.get("/health", headers={**admin_headers, "X-Profile": "1"})
+    assert response.status_code == 200
+    assert store.list() == []
+    assert "serving unprofiled" in caplog.text
+
+
+@pytest.mark.parametrize("environment, enabled", [("prod", False), ("dev", True), ("test", True)])
+def test_profiling_defaults_off_in_prod(monkeypatch, environment, enabled):
+    monkeypatch.delenv("PROFILING_ENABLED")
+    monkeypatch.setenv("ENVIRONMENT", environment)
+    assert Settings().profiling_enabled() is enabled
+
+    monkeypatch.setenv("PROFILING_ENABLED", "true")
+    assert Settings().profiling_enabled() is True
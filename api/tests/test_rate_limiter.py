@@ -0,0 +1,85 @@
+import time
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+import controllers.auth
+from db.database import AsyncSessionLocal
+from db.models import RateLimitBucket
+from services.rate_limiter import (
+    DatabaseBucketStore,
+    MemoryBucketStore,
+    RateLimit,
+    RateLimiter,
+    bucket_key,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+def _limit() -> RateLimit:
+    return RateLimit("test", burst=2, per_minute=60)
+
+
+async def _assert_third_hit_rejected(limiter: RateLimiter, limit: RateLimit, key: str) -> None:
+    await limiter.check(limit, key)
+    await limiter.check(limit, key)
+    with pytest.raises(HTTPException) as excinfo:
+        await limiter.check(limit, key)
+    assert excinfo.value.status_code == 429
+    assert excinfo.value.headers == {"Retry-After": "1"}
+
+
+async def test_memory_store_rejects_with_retry_after():
+    limiter = RateLimiter(MemoryBucketStore())
+    await _assert_third_hit_rejected(limiter, _limit(), "10.0.0.1")
+    # Other keys have their own bucket
+    await limiter.check(_limit(), "10.0.0.2")
+
+
+async def test_database_store_rejects_with_retry_after(client):
+    limiter = RateLimiter(DatabaseBucketStore(AsyncSessionLocal))
+    email = "a" * 243 + "@example.com"
+    await _assert_third_hit_rejected(limiter, _limit(), email)
+
+    async with AsyncSessionLocal() as session:
+        keys = (await session.execute(select(RateLimitBucket.key))).scalars().all()
+    assert keys == [bucket_key(f"test:{email}")]
+    assert len(keys[0]) == 64
+
+
+async def test_database_store_cleanup_removes_idle_buckets(client):
+    store = DatabaseBucketStore(AsyncSessionLocal)
+    for i in range(5):
+        await store.hit(f"test:{i}", _limit())
+    async with AsyncSessionLocal() as session:
+        assert await store.cleanup_idle_buckets(session, idle_seconds=3600, batch_size=2) == 0
+        time.sleep(0.01)
+        assert await store.cleanup_idle_buckets(session, idle_seconds=0, batch_size=2) == 5
+
+
+async def test_memory_store_evicts_least_recently_hit():
+    store = MemoryBucketStore(max_keys=2)
+    limit = _limit()
+    await store.hit("a", limit)
+    await store.hit("b", limit)
+    await store.hit("a", limit)
+    await store.hit("c", limit)
+
+    assert store.stats()["size"] == 2
+    assert store.evictions == 1
+    # "a" was hit more recently than "b", so "b" was dropped
+    assert await store.hit("a", limit) > 0
+    assert await store.hit("b", limit) == 0
+
+
+async def test_login_returns_429_with_retry_after(client, signup, monkeypatch):
+    monkeypatch.setattr(controllers.auth, "rate_limiter", RateLimiter(MemoryBucketStore()))
+    monkeypatch.setattr(controllers.auth, "login_email_limit", _limit())
+    await signup("alice@example.com")
+    credentials = {"email": "alice@example.com", "password": "wrong-password"}
+
+    for _ in range(2):
+        assert (await client.post("/api/v1/auth/login", json=credentials)).status_code == 401
+    response = await client.post("/api/v1/auth/login", json=credentials)
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "1"
@@ -0,0 +1,106 @@
+"""Read routing against a primary and replica SQLite files.
+
+Every database holds one ``marker`` row naming it, so a read shows
+where it was routed.
+"""
+import pytest
+from sqlalchemy import Column, MetaData, String, Table, exc, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+from db.routing import ReplicaSet, RoutingSession
+
+pytestmark = pytest.mark.anyio
+
+metadata = MetaData()
+marker = Table("marker", metadata, Column("name", String))
+
+
+async def _database(path, name: str):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=NullPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(metadata.create_all)
+        await conn.execute(insert(marker).values(name=name))
+    return engine
+
+
+@pytest.fixture
+async def databases(tmp_path):
+    engines = {
+        name: await _database(tmp_path / f"{name}.db", name)
+        for name in ("primary", "replica1", "replica2")
+    }
+    yield engines
+    for engine in engines.values():
+        await engine.dispose()
+
+
+def _read_sessions(primary, replica_set):
+    return sessionmaker(
+        class_=AsyncSession,
+        sync_session_class=RoutingSession,
+        expire_on_commit=False,
+        primary=primary,
+        replicas=replica_set
+    )
+
+
+async def _where(session) -> list[str]:
+    return list((await session.execute(select(marker.c.name))).scalars())
+
+
+async def test_sessions_are_spread_round_robin(databases):
+    replica_set = ReplicaSet([databases["replica1"], databases["replica2"]])
+    ReadSession = _read_sessions(databases["primary"], replica_set)
+
+    seen = []
+    for _ in range(4):
+        async with ReadSession() as session:
+            first = await _where(session)
+            # One replica per session
+            assert await _where(session) == first
+            seen.append(first[0])
+    assert seen == ["replica1", "replica2", "replica1", "replica2"]
+
+
+async def test_session_reads_its_own_writes_after_a_write(databases):
+    replica_set = ReplicaSet([databases["replica1"]])
+    ReadSession = _read_sessions(databases["primary"], replica_set)
+
+    async with ReadSession() as session:
+        assert await _where(session) == ["replica1"]
+        await session.execute(insert(marker).values(name="written"))
+        # Sticky to the primary from here on, including after commit
+        assert sorted(await _where(session)) == ["primary", "written"]
+        await session.commit()
+        assert sorted(await _where(session)) == ["primary", "written"]
+
+
+async def test_failing_replica_is_ejected_and_reads_fall_back_to_primary(databases, tmp_path):
+    broken = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'replica.db'}", poolclass=NullPool)
+    replica_set = ReplicaSet([broken], eject_seconds=60)
+    ReadSession = _read_sessions(databases["primary"], replica_set)
+
+    async with ReadSession() as session:
+        with pytest.raises(exc.OperationalError):
+            await _where(session)
+    assert not replica_set.replicas[0].available
+    assert replica_set.replicas[0].ejections == 1
+
+    async with ReadSession() as session:
+        assert await _where(session) == ["primary"]
+    assert replica_set.fallbacks == 1
+    await broken.dispose()
+
+
+async def test_ejected_replica_is_skipped_for_the_healthy_one(databases, tmp_path):
+    broken = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'replica.db'}", poolclass=NullPool)
+    replica_set = ReplicaSet([broken, databases["replica2"]], eject_seconds=60)
+    assert not await replica_set.probe(replica_set.replicas[0])
+    ReadSession = _read_sessions(databases["primary"], replica_set)
+
+    for _ in range(2):
+        async with ReadSession() as session:
+            assert await _where(session) == ["replica2"]
+    assert replica_set.fallbacks == 0
+    await broken.dispose()
@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta
+import pytest
+from db.database import AsyncSessionLocal
+from db.instrumentation import track_queries
+import services.token_blacklist
+from services.revocation_index import RevocationIndex
+
+pytestmark = pytest.mark.anyio
+
+
+async def _loaded_index(monkeypatch, **kwargs) -> RevocationIndex:
+    index = RevocationIndex(**kwargs)
+    async with AsyncSessionLocal() as session:
+        await index.sync(session)
+    monkeypatch.setattr(services.token_blacklist, "revocation_index", index)
+    return index
+
+
+async def test_logged_out_token_is_rejected_from_the_index(client, signup, login, monkeypatch):
+    index = await _loaded_index(monkeypatch)
+    await signup("alice@example.com")
+    headers = await login("alice@example.com")
+    assert (await client.get("/api/v1/users/me", headers=headers)).status_code == 200
+
+    assert (await client.post("/api/v1/auth/logout", headers=headers)).status_code == 200
+    assert index.stats()["size"] == 1
+
+    with track_queries() as stats:
+        response = await client.get("/api/v1/users/me", headers=headers)
+    assert response.status_code == 401
+    assert stats.count == 0
+    assert index.hits == 1
+
+
+async def test_revocations_from_other_workers_are_seen_after_sync(client, signup, login, monkeypatch):
+    index = await _loaded_index(monkeypatch)
+    await signup("alice@example.com")
+    headers = await login("alice@example.com")
+    assert (await client.post("/api/v1/auth/logout", headers=headers)).status_code == 200
+
+    other_worker = RevocationIndex()
+    async with AsyncSessionLocal() as session:
+        await other_worker.sync(session)
+    assert other_worker.stats()["size"] == 1
+    assert index.stats()["size"] == 1
+
+
+async def test_overflow_falls_back_to_the_table(client, signup, login, monkeypatch):
+    index = await _loaded_index(monkeypatch, max_entries=2)
+    index.add("a", datetime.utcnow() + timedelta(hours=1))
+    index.add("b", datetime.utcnow() + timedelta(hours=1))
+    await signup("alice@example.com")
+    headers = await login("alice@example.com")
+
+    assert (await client.post("/api/v1/auth/logout", headers=headers)).status_code == 200
+    assert index.stats() == {
+        "enabled": False,
+        "overflowed": True,
+        "size": 0,
+        "max_entries": 2,
+        "lookups": 0,
+        "hits": 0,
+    }
+
+    response = await client.get("/api/v1/users/me", headers=headers)
+    assert response.status_code == 401
+    assert index.lookups == 0
@@ -0,0 +1,99 @@
+import asyncio
+import pytest
+from sqlalchemy import update
+from db.database import AsyncSessionLocal
+from db.instrumentation import session_has_writes, track_queries
+from db.models import UserDB
+from services.single_flight import SingleFlight, user_by_id_flight
+from services.user_service import UserService
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_concurrent_callers_share_one_fetch():
+    flight = SingleFlight("test")
+    release = asyncio.Event()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return "result"
+
+    waiters = [asyncio.create_task(flight.do("key", fetch)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+    assert await asyncio.gather(*waiters) == ["result"] * 5
+    assert calls == 1
+    assert flight.stats() == {"in_flight": 0, "leaders": 1, "queries_saved": 4}
+
+    # Nothing is cached once the flight has landed
+    assert await flight.do("key", fetch) == "result"
+    assert calls == 2
+
+
+async def test_leader_error_reaches_followers():
+    flight = SingleFlight("test")
+    release = asyncio.Event()
+
+    async def fetch():
+        await release.wait()
+        raise RuntimeError("boom")
+
+    waiters = [asyncio.create_task(flight.do("key", fetch)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*waiters, return_exceptions=True)
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+async def test_followers_fetch_themselves_when_the_leader_is_cancelled():
+    flight = SingleFlight("test")
+    release = asyncio.Event()
+
+    async def slow_fetch():
+        await release.wait()
+        return "leader"
+
+    async def fetch():
+        return "follower"
+
+    leader = asyncio.create_task(flight.do("key", slow_fetch))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flight.do("key", fetch))
+    await asyncio.sleep(0)
+    leader.cancel()
+    assert await follower == "follower"
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+
+
+async def test_concurrent_user_lookups_run_one_query(client, signup):
+    user = await signup("shared@example.com")
+
+    async def lookup():
+        async with AsyncSessionLocal() as session:
+            return await UserService(session).get_user(user["id"])
+
+    with track_queries() as stats:
+        users = await asyncio.gather(*(lookup() for _ in range(10)))
+    assert {found.email for found in users} == {"shared@example.com"}
+    assert stats.count == 1
+
+
+async def test_sessions_that_wrote_are_not_coalesced(client, signup, monkeypatch):
+    user = await signup("writer@example.com")
+
+    async def shared_lookup(key, fetch):
+        raise AssertionError("a session with writes must not join a shared lookup")
+
+    monkeypatch.setattr(user_by_id_flight, "do", shared_lookup)
+    async with AsyncSessionLocal() as session:
+        assert not session_has_writes(session)
+        await session.execute(update(UserDB).where(UserDB.id == user["id"]).values(full_name="Renamed"))
+        await session.commit()
+        # Still true after commit: later reads must see this session's write
+        assert session_has_writes(session)
+        found = await UserService(session).get_user(user["id"])
+    assert found.full_name == "Renamed"
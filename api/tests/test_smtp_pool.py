@@ -0,0 +1,87 @@
+import socket
+from email.message import EmailMessage
+import pytest
+from aiosmtpd.controller import Controller
+from services.smtp_pool import SMTPConnectionPool
+
+pytestmark = pytest.mark.anyio
+
+
+class Sink:
+    def __init__(self):
+        self.recipients: list[str] = []
+        self.peers: set = set()
+
+    async def handle_DATA(self, server, session, envelope):
+        self.recipients.extend(envelope.rcpt_tos)
+        self.peers.add(session.peer)
+        return "250 OK"
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _message(to: str) -> EmailMessage:
+    message = EmailMessage()
+    message["From"] = "noreply@example.com"
+    message["To"] = to
+    message["Subject"] = "Test"
+    message.set_content("Hello")
+    return message
+
+
+@pytest.fixture
+def smtp_server():
+    sink = Sink()
+    controller = Controller(sink, hostname="127.0.0.1", port=_free_port())
+    controller.start()
+    yield sink, controller
+    if controller.loop.is_running():
+        controller.stop()
+
+
+async def test_send_many_uses_one_session(smtp_server):
+    sink, controller = smtp_server
+    pool = SMTPConnectionPool("127.0.0.1", controller.port, size=1)
+    errors = await pool.send_many([_message(f"user{number}@example.com") for number in range(3)])
+    await pool.close()
+    assert errors == [None, None, None]
+    assert sink.recipients == ["user0@example.com", "user1@example.com", "user2@example.com"]
+    assert len(sink.peers) == 1
+
+
+async def test_connection_is_reused_between_sends(smtp_server):
+    sink, controller = smtp_server
+    pool = SMTPConnectionPool("127.0.0.1", controller.port, size=1)
+    await pool.send(_message("first@example.com"))
+    await pool.send(_message("second@example.com"))
+    await pool.close()
+    assert len(sink.recipients) == 2
+    assert len(sink.peers) == 1
+
+
+async def test_dropped_connection_is_reopened(smtp_server):
+    sink, controller = smtp_server
+    pool = SMTPConnectionPool("127.0.0.1", controller.port, size=1)
+    await pool.send(_message("before@example.com"))
+    # Replace the server: the pooled session is now dead
+    controller.stop()
+    restarted = Controller(sink, hostname="127.0.0.1", port=controller.port)
+    restarted.start()
+    try:
+        await pool.send(_message("after@example.com"))
+        await pool.close()
+    finally:
+        restarted.stop()
+    assert sink.recipients == ["before@example.com", "after@example.com"]
+    assert len(sink.peers) == 2
+
+
+async def test_unreachable_server_fails_every_message():
+    pool = SMTPConnectionPool("127.0.0.1", _free_port(), size=1, timeout=1)
+    errors = await pool.send_many([_message("a@example.com"), _message("b@example.com")])
+    assert len(errors) == 2
+    assert all(error is not None for error in errors)
@@ -0,0 +1,69 @@
+"""Statements per write: each endpoint's work is a fixed number of queries."""
+import pytest
+from db.database import AsyncSessionLocal
+from db.instrumentation import assert_query_budget, track_queries
+from services.password_reset import PasswordResetService
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_create_user_is_one_insert_plus_outbox(client):
+    with assert_query_budget(2):
+        response = await client.post("/api/v1/users", json={
+            "email": "new@example.com",
+            "full_name": "New",
+            "password": "test-password",
+            "role": "CLIENT",
+        })
+    assert response.status_code == 200
+
+
+async def test_duplicate_signup_is_one_statement(client, signup):
+    await signup("taken@example.com")
+    with track_queries() as stats:
+        response = await client.post("/api/v1/users", json={
+            "email": "taken@example.com",
+            "full_name": "Again",
+            "password": "test-password",
+            "role": "CLIENT",
+        })
+    assert response.status_code == 400
+    assert stats.count == 1
+
+
+async def test_update_user_is_one_update(client, signup, login):
+    user = await signup("me@example.com")
+    headers = await login("me@example.com")
+    # Warm the principal cache so only the blacklist check and the update run
+    await client.get("/api/v1/users/me", headers=headers)
+    with track_queries(keep_statements=True) as stats:
+        response = await client.put(f"/api/v1/users/{user['id']}", json={"full_name": "Renamed"}, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["full_name"] == "Renamed"
+    writes = [statement for statement in stats.statements if not statement.lstrip().startswith("SELECT")]
+    assert len(writes) == 1 and writes[0].lstrip().startswith("UPDATE users")
+    assert stats.count == 2
+
+
+async def test_password_reset_confirm_is_delete_plus_update(client, signup):
+    user = await signup("reset@example.com")
+    async with AsyncSessionLocal() as session:
+        token = await PasswordResetService(session).create_token(user["id"])
+        await session.commit()
+
+    with assert_query_budget(2):
+        response = await client.post("/api/v1/auth/password-reset/confirm", json={
+            "token": token,
+            "new_password": "new-password",
+        })
+    assert response.status_code == 200
+
+
+async def test_invalid_reset_token_is_one_statement(client):
+    with track_queries() as stats:
+        response = await client.post("/api/v1/auth/password-reset/confirm", json={
+            "token": "forged",
+            "new_password": "new-password",
+        })
+    assert response.status_code == 400
+    assert stats.count == 1
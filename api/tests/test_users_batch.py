@@ -0,0 +1,60 @@
+import pytest
+from config import settings
+from db.database import ReadSessionLocal
+from services.user_service import UserService
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_batch_keeps_input_order_and_reports_missing(client, signup, login):
+    first = await signup("first@example.com")
+    second = await signup("second@example.com")
+    headers = await login("first@example.com")
+
+    response = await client.post(
+        "/api/v1/users/batch",
+        json={"ids": [second["id"], 999, first["id"], second["id"]]},
+        headers=headers
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert [user["email"] for user in body["items"]] == ["second@example.com", "first@example.com"]
+    assert body["missing"] == [999]
+
+
+async def test_batch_requires_authentication(client):
+    response = await client.post("/api/v1/users/batch", json={"ids": [1]})
+    assert response.status_code == 401
+
+
+async def test_batch_size_is_limited(client, signup, login):
+    await signup("limit@example.com")
+    headers = await login("limit@example.com")
+    ids = list(range(settings.USER_BATCH_MAX_SIZE + 1))
+    response = await client.post("/api/v1/users/batch", json={"ids": ids}, headers=headers)
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["type"] == "too_long"
+
+
+async def test_batch_honours_if_none_match(client, signup, login):
+    user = await signup("etag@example.com")
+    headers = await login("etag@example.com")
+    payload = {"ids": [user["id"], 999]}
+
+    response = await client.post("/api/v1/users/batch", json=payload, headers=headers)
+    etag = response.headers["etag"]
+    response = await client.post("/api/v1/users/batch", json=payload, headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
+    await client.put(f"/api/v1/users/{user['id']}", json={"full_name": "Changed"}, headers=headers)
+    response = await client.post("/api/v1/users/batch", json=payload, headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+
+
+async def test_batch_lookup_does_not_pin_the_read_session_to_the_primary(client, signup):
+    user = await signup("replica@example.com")
+    async with ReadSessionLocal() as session:
+        rows, missing = await UserService(session).get_user_rows_by_ids([user["id"]])
+        assert [row.id for row in rows] == [user["id"]]
+        assert not session.sync_session._sticky_primary
@@ -0,0 +1,60 @@
+import pytest
+from config import settings
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_bulk_rejects_non_utf8_upload(client, admin_headers):
+    response = await client.post(
+        "/api/v1/users/bulk",
+        content="email,full_name\nbad@example.com,Caf\xe9\n".encode("latin-1"),
+        headers={**admin_headers, "content-type": "text/csv"}
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Upload must be UTF-8 encoded"
+
+
+async def test_bulk_rejects_malformed_csv(client, admin_headers):
+    response = await client.post(
+        "/api/v1/users/bulk",
+        # One field over the csv module's field size limit
+        content=b"email,full_name\nbig@example.com," + b"x" * 200_000 + b"\n",
+        headers={**admin_headers, "content-type": "text/csv"}
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("Malformed CSV")
+
+
+async def test_bulk_rejects_oversized_body(client, admin_headers, monkeypatch):
+    monkeypatch.setattr(settings, "USER_BULK_MAX_BYTES", 64)
+    body = b"email,full_name,password,role\n" + b"x@example.com,X,pw,CLIENT\n" * 10
+
+    response = await client.post(
+        "/api/v1/users/bulk",
+        content=body,
+        headers={**admin_headers, "content-type": "text/csv"}
+    )
+    assert response.status_code == 413
+
+    async def chunks():
+        # No Content-Length: the streamed size is what counts
+        for _ in range(10):
+            yield b"x@example.com,X,pw,CLIENT\n"
+
+    response = await client.post(
+        "/api/v1/users/bulk",
+        content=chunks(),
+        headers={**admin_headers, "content-type": "text/csv"}
+    )
+    assert response.status_code == 413
+
+
+async def test_bulk_reports_rows_with_non_string_email(client, admin_headers):
+    body = b'{"email": 5, "full_name": "x", "password": "p", "role": "CLIENT"}\n{"email": null}\n'
+    response = await client.post(
+        "/api/v1/users/bulk",
+        content=body,
+        headers={**admin_headers, "content-type": "application/x-ndjson"}
+    )
+    assert response.status_code == 200
+    assert [result["status"] for result in response.json()["results"]] == ["invalid", "invalid"]
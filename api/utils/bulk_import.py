@@ -0,0 +1,56 @@
+import csv
+import io
+import json
+from fastapi import HTTPException, Request
+
+
+async def read_body(request: Request, max_bytes: int) -> bytes:
+    """Read the request body, rejecting it with 413 once it exceeds ``max_bytes``.
+
+    Content-Length is checked up front; the stream is also counted, since
+    the header can be missing (chunked uploads) or wrong.
+    """
+    too_large = HTTPException(
+        status_code=413,
+        detail=f"Upload too large, at most {max_bytes} bytes are accepted"
+    )
+    content_length = request.headers.get("content-length")
+    if content_length is not None and content_length.isdigit() and int(content_length) > max_bytes:
+        raise too_large
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > max_bytes:
+            raise too_large
+    return bytes(body)
+
+def parse_rows(body: bytes, content_type: str) -> list[dict | None]:
+    """Parse a CSV (with header) or NDJSON upload into one dict per row.
+
+    Rows that cannot be parsed at all are returned as ``None`` so they can
+    still be reported by position.
+    """
+    try:
+        text = body.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="Upload must be UTF-8 encoded")
+    if content_type.startswith("text/csv"):
+        try:
+            return [dict(row) for row in csv.DictReader(io.StringIO(text))]
+        except csv.Error as e:
+            raise HTTPException(status_code=400, detail=f"Malformed CSV: {e}")
+    if content_type.startswith(("application/x-ndjson", "application/jsonl", "application/json")):
+        rows: list[dict | None] = []
+        for line in text.splitlines():
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                row = None
+            rows.append(row if isinstance(row, dict) else None)
+        return rows
+    raise HTTPException(
+        status_code=415,
+        detail="Upload must be text/csv or application/x-ndjson"
+    )
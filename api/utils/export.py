@@ -0,0 +1,25 @@
+import csv
+import io
+import json
+from typing import Iterable, Sequence
+
+# Column order of exported user rows
+USER_EXPORT_COLUMNS = ("id", "email", "full_name", "is_active", "role")
+
+_json_encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+def _plain(value):
+    return value.value if hasattr(value, "value") else value
+
+def rows_to_ndjson(rows: Iterable[Sequence], columns: Sequence[str] = USER_EXPORT_COLUMNS) -> bytes:
+    lines = [_json_encode(dict(zip(columns, map(_plain, row)))) for row in rows]
+    lines.append("")
+    return "\n".join(lines).encode()
+
+def rows_to_csv(rows: Iterable[Sequence], header: Sequence[str] | None = None) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header is not None:
+        writer.writerow(header)
+    writer.writerows([_plain(value) for value in row] for row in rows)
+    return buffer.getvalue().encode()
@@ -0,0 +1,48 @@
+import hashlib
+from datetime import datetime
+from typing import Iterable
+import orjson
+from fastapi import Response
+
+# Responses may be stored by the client only, and must be revalidated
+CACHE_CONTROL = "private, no-cache"
+
+
+def _version(updated_at: datetime | None) -> str:
+    return f"{updated_at:%Y%m%d%H%M%S%f}" if updated_at is not None else "0"
+
+
+def user_etag(user_id: int, updated_at: datetime | None) -> str:
+    """Weak ETag of one user, from its id and ``updated_at``."""
+    return f'W/"{user_id}-{_version(updated_at)}"'
+
+
+def collection_etag(rows: Iterable, *extra) -> str:
+    """Weak ETag of a page of rows with ``id`` and ``updated_at``.
+
+    ``extra`` covers anything else in the body, such as the next cursor.
+    """
+    # orjson encodes the datetimes in C; much cheaper than formatting per row
+    payload = orjson.dumps([[row.id, row.updated_at] for row in rows] + list(extra))
+    return f'W/"{hashlib.blake2b(payload, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison of ``etag`` against an If-None-Match header."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def cache_headers(etag: str) -> dict:
+    return {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+
+def not_modified(if_none_match: str | None, etag: str) -> Response | None:
+    """A bodyless 304 when the client already has ``etag``, else None."""
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=cache_headers(etag))
+    return None
@@ -0,0 +1,88 @@
+"""Prometheus metrics shared by the middleware, database and services.
+
+With several worker processes, set ``PROMETHEUS_MULTIPROC_DIR`` to an
+empty, writable directory before the workers start: every process then
+writes its samples there and ``/metrics`` aggregates all of them.
+"""
+import os
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+MULTIPROCESS = "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+
+http_requests_in_flight = Gauge(
+    "http_requests_in_flight",
+    "Requests currently being served",
+    multiprocess_mode="livesum",
+)
+http_request_duration_seconds = Histogram(
+    "http_request_duration_seconds",
+    "Request duration by route template",
+    ["method", "route"],
+)
+http_requests_total = Counter(
+    "http_requests_total",
+    "Requests by route template and status code",
+    ["method", "route", "status"],
+)
+http_request_db_queries = Histogram(
+    "http_request_db_queries",
+    "Database statements executed per request",
+    ["method", "route"],
+    buckets=QUERY_COUNT_BUCKETS,
+)
+http_request_db_seconds = Histogram(
+    "http_request_db_seconds",
+    "Time spent in database statements per request",
+    ["method", "route"],
+)
+password_hash_seconds = Histogram(
+    "password_hash_seconds",
+    "bcrypt time per job, excluding time queued for a worker",
+    ["operation"],
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1, 2, 5, 10),
+)
+smtp_send_seconds = Histogram(
+    "smtp_send_seconds",
+    "Time to hand one message to the SMTP server",
+    ["result"],
+)
+rate_limit_decisions_total = Counter(
+    "rate_limit_decisions_total",
+    "Rate limiter decisions by limit",
+    ["limit", "decision"],
+)
+single_flight_calls_total = Counter(
+    "single_flight_calls_total",
+    "Coalesced lookups; follower calls are queries saved",
+    ["lookup", "role"],
+)
+
+# Label sets known up front are resolved once here
+smtp_send_ok = smtp_send_seconds.labels("ok")
+smtp_send_error = smtp_send_seconds.labels("error")
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Current samples in the Prometheus text format, and its content type."""
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead(pid: int) -> None:
+    """Drop a stopped worker's live gauges from the aggregate."""
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(pid)
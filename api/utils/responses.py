@@ -0,0 +1,25 @@
+from typing import Any, Iterable, Sequence
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson (enums, datetimes and UUIDs included)."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+class RowSerializer:
+    """Turns result rows into JSON-ready dicts without building models.
+
+    The column names are fixed when the serializer is created, so each row
+    costs one ``dict(zip(...))``; orjson renders enum members by value.
+    """
+
+    def __init__(self, columns: Sequence[str]):
+        self.columns = tuple(columns)
+
+    def to_dicts(self, rows: Iterable[Sequence]) -> list[dict]:
+        columns = self.columns
+        return [dict(zip(columns, row)) for row in rows]
@@ -1,7 +1,12 @@
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from passlib.context import CryptContext
 from datetime import datetime, timedelta
+from fastapi import HTTPException, status
 from jose import JWTError, jwt
 from config import settings
+from utils.metrics import password_hash_seconds
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -11,6 +16,140 @@ def get_password_hash(password: str) -> str:
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
+def _hash_batch(passwords: list[str]) -> list[str]:
+    return [pwd_context.hash(password) for password in passwords]
+
+def _timed_call(func, *args) -> tuple:
+    """Run a hashing function in a worker and report how long it took there."""
+    started = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started
+
+
+class PasswordHasher:
+    """Runs bcrypt off the event loop on a bounded worker pool.
+
+    bcrypt releases the GIL, so a thread pool is enough to keep the loop
+    responsive; a process pool can be selected to spread hashing over cores.
+    When more than ``max_queue`` jobs are pending, new calls are rejected
+    with a 503 instead of piling up behind the pool.
+    """
+
+    def __init__(
+        self,
+        executor: str = "thread",
+        workers: int = 4,
+        max_queue: int = 64,
+        batch_workers: int | None = None
+    ):
+        self.executor_kind = executor
+        self.workers = workers
+        self.max_queue = max_queue
+        # Workers a bulk hash may occupy; the rest stay free for logins
+        if batch_workers is None:
+            batch_workers = workers - 1
+        self.batch_workers = min(max(batch_workers, 1), workers)
+        self._executor: Executor | None = None
+        self._pending = 0
+        # Metrics
+        self.calls = 0
+        self.rejected = 0
+        self.wait_seconds_total = 0.0
+        self.hash_seconds_total = 0.0
+
+        # Histogram children per operation, resolved once
+        self._hash_timers = {
+            operation: password_hash_seconds.labels(operation)
+            for operation in ("hash", "verify", "hash_batch")
+        }
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers,
+                    thread_name_prefix="password-hasher"
+                )
+        return self._executor
+
+    async def _run(self, operation: str, func, *args):
+        if self._pending >= self.max_queue:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy, please retry shortly",
+                headers={"Retry-After": "1"},
+            )
+
+        self._pending += 1
+        submitted = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            result, hash_seconds = await loop.run_in_executor(
+                self._get_executor(), _timed_call, func, *args
+            )
+        finally:
+            self._pending -= 1
+
+        total = time.perf_counter() - submitted
+        self.calls += 1
+        self.hash_seconds_total += hash_seconds
+        self.wait_seconds_total += max(total - hash_seconds, 0.0)
+        self._hash_timers[operation].observe(hash_seconds)
+        return result
+
+    async def hash(self, password: str) -> str:
+        return await self._run("hash", get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run("verify", verify_password, plain_password, hashed_password)
+
+    async def hash_many(self, passwords: list[str], chunk_size: int = 4) -> list[str]:
+        """Hash many passwords in parallel, preserving order.
+
+        At most ``batch_workers`` chunks are in flight, so with more than one
+        worker at least one stays free for interactive logins. Chunks are
+        small (about a second of bcrypt each) so that a login queued behind
+        one is not held up for long.
+        """
+        chunks = [passwords[i:i + chunk_size] for i in range(0, len(passwords), chunk_size)]
+        in_flight = asyncio.Semaphore(self.batch_workers)
+
+        async def hash_chunk(chunk: list[str]) -> list[str]:
+            async with in_flight:
+                return await self._run("hash_batch", _hash_batch, chunk)
+
+        results = await asyncio.gather(*(hash_chunk(chunk) for chunk in chunks))
+        return [hashed for chunk in results for hashed in chunk]
+
+    def stats(self) -> dict:
+        return {
+            "executor": self.executor_kind,
+            "workers": self.workers,
+            "batch_workers": self.batch_workers,
+            "pending": self._pending,
+            "max_queue": self.max_queue,
+            "calls": self.calls,
+            "rejected": self.rejected,
+            "wait_seconds_total": round(self.wait_seconds_total, 6),
+            "hash_seconds_total": round(self.hash_seconds_total, 6),
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    executor=settings.PASSWORD_HASH_EXECUTOR,
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+    batch_workers=settings.PASSWORD_HASH_BATCH_WORKERS,
+)
+
 def decode_access_token(token: str) -> int | None:
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
@@ -19,4 +158,4 @@ def decode_access_token(token: str) -> int | None:
             return None
         return int(user_id)
     except JWTError:
-        return None 
\ No newline at end of file
+        return None
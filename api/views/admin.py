@@ -0,0 +1,26 @@
+from fastapi import APIRouter, Depends
+from typing import Literal
+from controllers.admin import AdminController
+from models.admin import ProfileList
+from models.user import User
+from views.auth import get_current_user
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+@router.get("/profiles", response_model=ProfileList)
+async def list_profiles(current_user: User = Depends(get_current_user)) -> ProfileList:
+    """Most recent request profiles, newest first (admin only)."""
+    return await AdminController.list_profiles(current_user)
+
+@router.get("/profiles/{profile_id}")
+async def get_profile(
+    profile_id: int,
+    format: Literal["speedscope", "html"] = "speedscope",
+    current_user: User = Depends(get_current_user)
+):
+    """One profile as speedscope JSON or as a pyinstrument HTML page (admin only)."""
+    return await AdminController.get_profile(current_user, profile_id, format)
+
+@router.delete("/profiles", status_code=204)
+async def clear_profiles(current_user: User = Depends(get_current_user)) -> None:
+    return await AdminController.clear_profiles(current_user)
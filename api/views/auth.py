@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, Security, HTTPException, status
+from fastapi import APIRouter, Depends, Request, Security, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm, OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 from models.auth import Token, LoginRequest, PasswordResetRequest, PasswordResetConfirm
@@ -10,8 +10,13 @@ from db.database import get_db
 router = APIRouter(prefix="/auth", tags=["authentication"])
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/token")
 
+def _client_ip(request: Request) -> str | None:
+    # Behind a proxy, run uvicorn with --proxy-headers so this is the real client
+    return request.client.host if request.client else None
+
 @router.post("/token", response_model=Token)
 async def login_for_access_token(
+    request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: AsyncSession = Depends(get_db)
 ):
@@ -19,14 +24,15 @@ async def login_for_access_token(
         email=form_data.username,
         password=form_data.password
     )
-    return await AuthController.login(login_request, db)
+    return await AuthController.login(login_request, db, client_ip=_client_ip(request))
 
 @router.post("/login", response_model=Token)
 async def login(
     login_data: LoginRequest,
+    request: Request,
     db: AsyncSession = Depends(get_db)
 ):
-    return await AuthController.login(login_data, db)
+    return await AuthController.login(login_data, db, client_ip=_client_ip(request))
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
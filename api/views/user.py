@@ -1,12 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from controllers.user import UserController, router as user_router
-from models.user import User, UserCreate, UserUpdate
-from db.database import get_db
+from models.user import User, UserCreate, UserUpdate, UserPage, UserBatch, UserBatchRequest, BulkUserReport
+from db.database import get_db, get_read_db
 from views.auth import get_current_user
-from typing import List
+from typing import Literal
 from db.models import UserRole
 from services.user_service import UserService
+from utils.bulk_import import read_body
+from config import settings
 from fastapi import Depends
 
 # Create router with prefix
@@ -15,12 +17,27 @@ router = APIRouter(prefix="/users", tags=["users"])
 # Mount the controller router first (for /list endpoint)
 router.include_router(user_router)
 
-@router.get("/list", response_model=List[User])
+@router.get("/list", response_model=UserPage)
 async def get_users(
+    limit: int = Query(100, ge=1, le=500),
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
+    role: UserRole | None = None,
+    is_active: bool | None = None,
+    email_prefix: str | None = Query(None, min_length=1),
+    if_none_match: str | None = Header(None),
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
-) -> List[User]:
-    return await UserController.get_users_list(current_user, db)
+    db: AsyncSession = Depends(get_read_db)
+):
+    return await UserController.get_users_list(
+        current_user,
+        db,
+        limit=limit,
+        cursor=cursor,
+        role=role,
+        is_active=is_active,
+        email_prefix=email_prefix,
+        if_none_match=if_none_match
+    )
 
 @router.post("", response_model=User)
 async def create_user(
@@ -29,16 +46,59 @@ async def create_user(
 ) -> User:
     return await UserController.create_user(user_data, db)
 
+@router.post("/bulk", response_model=BulkUserReport)
+async def bulk_create_users(
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+) -> BulkUserReport:
+    """Create users from a CSV (with header) or NDJSON body (admin only).
+
+    Columns/keys are the same as for POST /users: email, full_name,
+    password and role.
+    """
+    body = await read_body(request, settings.USER_BULK_MAX_BYTES)
+    content_type = request.headers.get("content-type", "")
+    return await UserController.bulk_create_users(current_user, body, content_type, db)
+
+@router.post("/batch", response_model=UserBatch)
+async def get_users_batch(
+    batch: UserBatchRequest,
+    if_none_match: str | None = Header(None),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Fetch several users in one request.
+
+    Users come back in the order of ``ids``; ids with no user are listed
+    in ``missing``. POST only carries the id list: the request is a read,
+    and like ``/list`` it carries an ETag and honours If-None-Match.
+    """
+    return await UserController.get_users_batch(batch, db, if_none_match)
+
 @router.get("/me", response_model=User)
-async def read_users_me(current_user: User = Depends(get_current_user)):
-    return current_user 
+async def read_users_me(
+    if_none_match: str | None = Header(None),
+    current_user: User = Depends(get_current_user)
+):
+    return UserController.user_response(current_user, if_none_match)
+
+@router.get("/export")
+async def export_users(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    chunk_size: int = Query(1000, ge=1, le=10000),
+    current_user: User = Depends(get_current_user)
+):
+    """Stream every user as NDJSON or CSV (admin only)."""
+    return await UserController.export_users(current_user, format, chunk_size)
 
 @router.get("/{user_id}", response_model=User)
 async def get_user(
     user_id: int,
-    db: AsyncSession = Depends(get_db)
-) -> User:
-    return await UserController.get_user(user_id, db)
+    if_none_match: str | None = Header(None),
+    db: AsyncSession = Depends(get_read_db)
+):
+    return await UserController.get_user(user_id, db, if_none_match)
 
 @router.put("/{user_id}", response_model=User)
 #get current user 
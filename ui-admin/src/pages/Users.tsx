@@ -15,12 +15,13 @@ interface User {
 
 export default function Users() {
   const [users, setUsers] = useState<User[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [loading, setLoading] = useState(true);
   const navigate = useNavigate();
   const [modalOpen, setModalOpen] = useState(false);
   const [userToDelete, setUserToDelete] = useState<number | null>(null);
 
-  const fetchUsers = async () => {
+  const fetchUsers = async (cursor: string | null = null) => {
     try {
       const token = localStorage.getItem("token");
       if (!token) {
@@ -34,10 +35,14 @@ export default function Users() {
           headers: {
             Authorization: `Bearer ${token}`,
           },
+          params: cursor ? { cursor } : undefined,
         }
       );
 
-      setUsers(response.data);
+      setUsers((current) =>
+        cursor ? [...current, ...response.data.items] : response.data.items
+      );
+      setNextCursor(response.data.next_cursor);
     } catch (error) {
       console.error("Failed to fetch users:", error);
       if (axios.isAxiosError(error) && error.response?.status === 401) {
@@ -164,6 +169,16 @@ export default function Users() {
                 ))}
               </tbody>
             </table>
+            {nextCursor && (
+              <div className="flex justify-center p-4">
+                <button
+                  onClick={() => fetchUsers(nextCursor)}
+                  className="px-4 py-2 text-sm text-blue-600 hover:text-blue-900"
+                >
+                  Load more
+                </button>
+              </div>
+            )}
           </div>
         )}
       </main>